@@ -138,6 +138,9 @@ class Settings:
     METRICS_FILE_ENABLED = os.getenv("METRICS_FILE_ENABLED", "true").lower() == "true"
     METRICS_FILE_DIR = os.getenv("METRICS_FILE_DIR", "./data/processed/metrics")
     METRICS_FLUSH_INTERVAL_SEC = int(os.getenv("METRICS_FLUSH_INTERVAL_SEC", "60"))
+    # profile_performance: zamanlama her cagrida (perf_counter_ns), RSS/CPU probu her N cagrida bir (1 = her cagri)
+    PROFILE_PROBE_SAMPLE_EVERY = int(os.getenv("PROFILE_PROBE_SAMPLE_EVERY", "100"))
+    PROFILE_EXPORT_INTERVAL_SEC = float(os.getenv("PROFILE_EXPORT_INTERVAL_SEC", "15"))
     LATENCY_ANOMALY_MS = float(os.getenv("LATENCY_ANOMALY_MS", "1000"))  # ortalama acilis latency bu esigi gecerse uyar
     SLIPPAGE_ANOMALY_BPS = float(os.getenv("SLIPPAGE_ANOMALY_BPS", "35"))  # ortalama entry slip bps bu esigi gecerse uyar
     # Anomaly risk reduction multiplier (risk_percent *= multiplier on anomaly, restore on recovery)
@@ -156,6 +159,28 @@ class Settings:
     # Indicators
     INDICATORS_CONFIG = "config/indicators.json"
 
+    # OHLCV storage: ikili kolon bazli store (CSV yerine); CSV aynasi istege bagli
+    OHLCV_STORE_ENABLED = os.getenv("OHLCV_STORE_ENABLED", "true").lower() == "true"
+    OHLCV_CSV_MIRROR = os.getenv("OHLCV_CSV_MIRROR", "false").lower() == "true"
+    # Delta kline fetch: yalnizca store'daki son bardan sonrasini indir (startTime sayfalama)
+    KLINE_DELTA_FETCH_ENABLED = os.getenv("KLINE_DELTA_FETCH_ENABLED", "true").lower() == "true"
+    KLINES_PAGE_LIMIT = int(os.getenv("KLINES_PAGE_LIMIT", "1000"))  # Binance tek istek ust siniri
+    # get_pair_data bellek ici LRU frame cache (symbol, interval) adedi; 0 = kapali
+    PAIR_FRAME_CACHE_SIZE = int(os.getenv("PAIR_FRAME_CACHE_SIZE", "64"))
+    # Artimli indikator motoru: (symbol, timeframe) basina state, yeni bar basina sabit maliyetli
+    # guncelleme. Varsayilan kapali (opt-in); ADX ara NaN'lari batch'teki bfill yerine ffill alir.
+    INCREMENTAL_INDICATORS_ENABLED = os.getenv("INCREMENTAL_INDICATORS_ENABLED", "false").lower() == "true"
+    INCREMENTAL_INDICATOR_STATES = int(os.getenv("INCREMENTAL_INDICATOR_STATES", "512"))
+    # Paralel sinyal dongusu: 1 = seri (varsayilan). >1 ise veri/hacim okuma thread'lerde,
+    # indikator+skor asamasi SIGNAL_CPU_EXECUTOR ile ('thread' | 'process') kosar; histerezis
+    # ve final asama her zaman seri ve giris sirasinda.
+    SIGNAL_WORKERS = int(os.getenv("SIGNAL_WORKERS", "1"))
+    SIGNAL_CPU_EXECUTOR = os.getenv("SIGNAL_CPU_EXECUTOR", "thread").lower()
+    # Toplu 24h ticker snapshot (hacim/bid/ask/son fiyat): tek REST cagrisi TTL boyunca paylasilir.
+    # Spread guard snapshot'i yalnizca SPREAD_SNAPSHOT_MAX_AGE_SEC'ten tazeyse kullanir.
+    TICKER_SNAPSHOT_TTL_SEC = float(os.getenv("TICKER_SNAPSHOT_TTL_SEC", "30"))
+    SPREAD_SNAPSHOT_MAX_AGE_SEC = float(os.getenv("SPREAD_SNAPSHOT_MAX_AGE_SEC", "10"))
+
     # Other
     BACKTEST_DAYS = 30
     TIMEFRAME = "1h"
@@ -197,6 +222,13 @@ class Settings:
     # Clock skew guard
     CLOCK_SKEW_WARN_MS = float(os.getenv("CLOCK_SKEW_WARN_MS", "500"))
     CLOCK_SKEW_GUARD_ENABLED = os.getenv("CLOCK_SKEW_GUARD_ENABLED", "true").lower() == "true"
+    # CR-0069 guard event yazimi: arka plan writer (tek WAL baglantisi, toplu commit)
+    GUARD_EVENTS_ASYNC = os.getenv("GUARD_EVENTS_ASYNC", "true").lower() == "true"
+    GUARD_EVENTS_QUEUE_MAX = int(os.getenv("GUARD_EVENTS_QUEUE_MAX", "10000"))
+    GUARD_EVENTS_BATCH_SIZE = int(os.getenv("GUARD_EVENTS_BATCH_SIZE", "64"))
+    GUARD_EVENTS_FLUSH_INTERVAL_MS = float(os.getenv("GUARD_EVENTS_FLUSH_INTERVAL_MS", "250"))
+    # Kuyruk doluysa bekleme suresi; 0 = beklemeden dusur (trade yolunu bloklama)
+    GUARD_EVENTS_ENQUEUE_TIMEOUT_MS = float(os.getenv("GUARD_EVENTS_ENQUEUE_TIMEOUT_MS", "0"))
 
     # --- RBP-LS v1.3.1 PoR: Geriye uyumlu konfig genislemeleri ---
     # Strateji surum bilgisi (telemetri/determinism icin bilgi amacli)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""Tek seferlik CSV -> ikili OHLCV store migrasyonu.
+
+- DATA_PATH/raw altindaki {SYMBOL}_{interval}.csv dosyalarini okur.
+- Her birini {SYMBOL}_{interval}.ohlcv/ kolon bazli store'una yazar.
+- CSV dosyalari silinmez; store'u CSV'den yeni olanlar atlanir (--force ile zorla).
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.settings import Settings  # noqa: E402
+
+from src.utils.ohlcv_store import OhlcvStore  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="CSV parite verilerini ikili store'a tasi")
+    ap.add_argument('--interval', default=None, help='Yalnizca bu interval (orn. 1h)')
+    ap.add_argument('--force', action='store_true', help='Guncel store olsa bile yeniden yaz')
+    args = ap.parse_args(argv)
+    store = OhlcvStore(str(pathlib.Path(Settings.DATA_PATH) / 'raw'))
+    migrated = store.migrate_all(interval=args.interval, force=args.force)
+    for name, rows in migrated.items():
+        print(f"{name}: {rows} satir")
+    print(f"Toplam {len(migrated)} dosya tasindi")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
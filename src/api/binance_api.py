@@ -3,6 +3,7 @@ import hmac
 import math
 import random
 import time
+import zlib
 
 import pandas as pd
 import requests
@@ -13,6 +14,27 @@ from config.settings import RuntimeConfig, Settings
 from src.utils.logger import get_logger
 from src.utils.prometheus_export import get_exporter_instance
 
+# Kline interval -> milisaniye (offline sentetik veri ve delta fetch sayfalama icin)
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 180_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+    '2h': 7_200_000,
+    '4h': 14_400_000,
+    '6h': 21_600_000,
+    '8h': 28_800_000,
+    '12h': 43_200_000,
+    '1d': 86_400_000,
+}
+KLINE_COLUMNS = [
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'count', 'taker_buy_volume',
+    'taker_buy_quote_volume', 'ignore'
+]
+
 
 class BinanceAPI:
     def __init__(self, mode: str | None = None):
@@ -346,7 +368,9 @@ class BinanceAPI:
     def get_top_pairs(self, limit=150):
         try:
             self.logger.info(f"Top {limit} pariteler aliniyor")
-            tickers = self.get_ticker_24hr()
+            # Paylasilan snapshot: ayni TTL icinde sinyal dongusu ayni toplu cekimi kullanir
+            from src.api.ticker_snapshot import get_ticker_snapshot
+            tickers = get_ticker_snapshot(self).tickers()
             if not tickers:
                 self.logger.warning("Ticker listesi boş döndü")
                 return []
@@ -371,57 +395,94 @@ class BinanceAPI:
             self.logger.error(f"get_top_pairs hata: {e}")
             return []
 
-    def get_historical_klines(self, symbol, interval, limit=500):
+    def get_historical_klines(self, symbol, interval, limit=500, start_time: int | None = None):
+        """Ham kline listesi. start_time (ms) verilirse o zamandan itibaren en fazla limit bar."""
         if Settings.OFFLINE_MODE:
-            # Generate synthetic OHLCV walk for deterministic offline tests
-            import time
-            now_ms = int(time.time() * 1000)
-            # Map common intervals to milliseconds, default 1h
-            interval_map = {
-                '1m': 60_000,
-                '3m': 180_000,
-                '5m': 300_000,
-                '15m': 900_000,
-                '30m': 1_800_000,
-                '1h': 3_600_000,
-                '2h': 7_200_000,
-                '4h': 14_400_000,
-                '6h': 21_600_000,
-                '8h': 28_800_000,
-                '12h': 43_200_000,
-                '1d': 86_400_000,
-            }
-            step_ms = interval_map.get(interval, 3_600_000)
-            start = now_ms - step_ms * limit
-            price = 100.0 + (hash(symbol) % 100)  # symbol-based base
-            out = []
-            for i in range(limit):
-                ts = start + i * step_ms
-                # random-ish but deterministic-ish using i & symbol hash
-                delta = ((hash(symbol) >> (i % 16)) & 0xF) / 200.0  # up to ~0.08
-                direction = 1 if ((hash(symbol) + i) % 2 == 0) else -1
-                open_p = price
-                close_p = max(0.1, open_p * (1 + direction * delta))
-                high_p = max(open_p, close_p) * (1 + 0.001)
-                low_p = min(open_p, close_p) * (1 - 0.001)
-                vol = 1000 + ((hash(symbol) + i) % 5000)
-                quote_vol = vol * (open_p + close_p) / 2
-                price = close_p
-                out.append([
-                    ts, f"{open_p:.4f}", f"{high_p:.4f}", f"{low_p:.4f}", f"{close_p:.4f}", f"{vol:.4f}",
-                    ts + step_ms - 1, f"{quote_vol:.4f}", 0, f"{vol/2:.4f}", f"{quote_vol/2:.4f}", "0"
-                ])
-            return out
-        # Live / normal mode
-        if self.mode == "futures":
-            # Use spot klines for simplicity; could switch to futures klines if needed
-            return self.client.get_klines(symbol=symbol, interval=interval, limit=limit)
-        return self.client.get_klines(symbol=symbol, interval=interval, limit=limit)
+            return self._offline_klines(symbol, interval, limit, start_time)
+        # Live / normal mode (futures icin de basitlik adina spot klines kullanilir)
+        params = {'symbol': symbol, 'interval': interval, 'limit': limit}
+        if start_time is not None:
+            params['startTime'] = int(start_time)
+        return self.client.get_klines(**params)
+
+    @staticmethod
+    def _offline_close(seed: int, bar_index: int) -> float:
+        """Offline sentetik kapanis: mutlak bar indeksinin deterministik fonksiyonu."""
+        base = 100.0 + (seed % 100)
+        phase = (seed >> 8) % 360
+        return base * (1 + 0.05 * math.sin((bar_index + phase) / 37.0) + 0.02 * math.sin((bar_index + phase) / 7.3))
+
+    def _offline_klines(self, symbol, interval, limit=500, start_time: int | None = None):
+        """OFFLINE_MODE icin deterministik sentetik OHLCV.
+
+        Barlar interval sinirlarina hizalidir (son bar = olusan mum) ve fiyat mutlak bar
+        indeksinden turetilir; boylece tam cekim ile delta cekim ayni izgarada ayni
+        degerleri uretir ve yeniden cekilen son bar store'daki bari birebir degistirir.
+        """
+        now_ms = int(time.time() * 1000)
+        step_ms = INTERVAL_MS.get(interval, 3_600_000)
+        end = (now_ms // step_ms) * step_ms  # olusan mumun acilisi
+        if start_time is not None:
+            start = -(-int(start_time) // step_ms) * step_ms  # interval sinirina yukari hizala
+            limit = max(0, min(limit, (end - start) // step_ms + 1))
+        else:
+            start = end - step_ms * (limit - 1)
+        seed = zlib.crc32(symbol.encode("utf-8"))  # hash() surec basina rastgele; crc sabit
+        out = []
+        for i in range(limit):
+            ts = start + i * step_ms
+            k = ts // step_ms
+            open_p = self._offline_close(seed, k - 1)
+            close_p = self._offline_close(seed, k)
+            high_p = max(open_p, close_p) * (1 + 0.001)
+            low_p = min(open_p, close_p) * (1 - 0.001)
+            vol = 1000 + ((seed + k) % 5000)
+            quote_vol = vol * (open_p + close_p) / 2
+            out.append([
+                ts, f"{open_p:.4f}", f"{high_p:.4f}", f"{low_p:.4f}", f"{close_p:.4f}", f"{vol:.4f}",
+                ts + step_ms - 1, f"{quote_vol:.4f}", 0, f"{vol/2:.4f}", f"{quote_vol/2:.4f}", "0"
+            ])
+        return out
 
     def get_klines(self, symbol, interval="1h", limit=500):
         """Get klines data - wrapper around get_historical_klines for compatibility"""
         return self.get_historical_klines(symbol, interval, limit)
 
+    def get_klines_since(self, symbol, interval, start_time: int, max_bars: int | None = None):
+        """start_time (ms, dahil) sonrasindaki tum klineleri sayfalayarak getir.
+
+        Tek istek limitinden (KLINES_PAGE_LIMIT) uzun bosluklar startTime ilerletilerek
+        birden fazla istekle doldurulur; tekrar eden acilis zamanlari ayiklanir.
+        """
+        page_limit = int(getattr(Settings, 'KLINES_PAGE_LIMIT', 1000))
+        step_ms = INTERVAL_MS.get(interval, 3_600_000)
+        cursor = int(start_time)
+        out = []
+        seen_last = None
+        while True:
+            want = page_limit if max_bars is None else min(page_limit, max_bars - len(out))
+            if want <= 0:
+                break
+            batch = self.get_historical_klines(symbol, interval, limit=want, start_time=cursor) or []
+            if seen_last is not None:
+                batch = [k for k in batch if int(k[0]) > seen_last]
+            if not batch:
+                break
+            out.extend(batch)
+            seen_last = int(batch[-1][0])
+            if len(batch) < want:
+                break
+            cursor = seen_last + step_ms
+        return out
+
+    @staticmethod
+    def klines_to_frame(klines) -> pd.DataFrame:
+        df = pd.DataFrame(klines, columns=KLINE_COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        for col in ['open','high','low','close','volume','quote_volume']:
+            df[col] = pd.to_numeric(df[col])
+        return df
+
     def get_order_book(self, symbol: str, limit: int = 10):
         """Get order book depth"""
         try:
@@ -434,15 +495,11 @@ class BinanceAPI:
 
     def get_historical_data(self, symbol, interval="1h", days=30):
         klines = self.get_historical_klines(symbol, interval, limit=days*24)
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'count', 'taker_buy_volume',
-            'taker_buy_quote_volume', 'ignore'
-        ])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open','high','low','close','volume','quote_volume']:
-            df[col] = pd.to_numeric(df[col])
-        return df
+        return self.klines_to_frame(klines)
+
+    def get_historical_data_since(self, symbol, interval, start_time: int, max_bars: int | None = None):
+        """Delta fetch: start_time (ms) ve sonrasi barlar DataFrame olarak."""
+        return self.klines_to_frame(self.get_klines_since(symbol, interval, start_time, max_bars=max_bars))
 
     # ---------- Trading ----------
     def place_order(self, symbol, side, order_type, quantity, price=None, **kwargs):
@@ -0,0 +1,145 @@
+"""Toplu 24h ticker snapshot servisi.
+
+Tek bir `get_ticker_24hr` (tum semboller) cagrisi ile hacim, bid/ask ve son fiyat
+TTL boyunca bellekte tutulur; sinyal dongusu (24h hacim), spread guard ve top-pair
+siralamasi sembol basina REST cagrisi yapmak yerine buradan okur.
+
+- Snapshot market moduna gore paylasilir (ayni moddaki tum BinanceAPI orneklerinde tek kopya).
+- Yenileme single-flight: suresi dolmus snapshot'i ayni anda isteyen thread'lerden yalnizca
+  biri REST cagrisi yapar, digerleri ayni sonucu kullanir.
+- Yenileme hatasinda eldeki (eski) snapshot korunur; bos snapshot'ta cagiran taraf kendi
+  sembol bazli yoluna duser.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config.settings import Settings
+
+from src.utils.logger import get_logger
+
+logger = get_logger("TickerSnapshot")
+
+
+def _num(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TickerSnapshot:
+    """TTL cache'li toplu ticker snapshot'i."""
+
+    def __init__(self, api, ttl_sec: Optional[float] = None):
+        self.api = api
+        self.ttl_sec = float(ttl_sec if ttl_sec is not None else getattr(Settings, 'TICKER_SNAPSHOT_TTL_SEC', 30.0))
+        self._lock = threading.Lock()
+        self._raw: List[dict] = []
+        self._by_symbol: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self.refresh_count = 0
+
+    def age(self) -> Optional[float]:
+        """Snapshot yasi (sn); hic cekilmediyse None."""
+        return (time.time() - self._fetched_at) if self._fetched_at else None
+
+    def _is_fresh(self, max_age: Optional[float] = None) -> bool:
+        age = self.age()
+        return age is not None and age < (self.ttl_sec if max_age is None else max_age)
+
+    def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        with self._lock:
+            # Lock beklerken baska thread yenilemis olabilir
+            if self._is_fresh():
+                return
+            try:
+                tickers = self.api.get_ticker_24hr()
+            except Exception as e:
+                logger.warning(f"Ticker snapshot yenilenemedi: {e}")
+                return
+            if not tickers:
+                return
+            by_symbol = {}
+            for t in tickers:
+                symbol = t.get('symbol') if isinstance(t, dict) else None
+                if not symbol:
+                    continue
+                by_symbol[symbol] = {
+                    'symbol': symbol,
+                    'quote_volume': _num(t.get('quoteVolume')),
+                    'volume': _num(t.get('volume')),
+                    'bid': _num(t.get('bidPrice')),
+                    'ask': _num(t.get('askPrice')),
+                    'last': _num(t.get('lastPrice')),
+                }
+            self._raw = list(tickers)
+            self._by_symbol = by_symbol
+            self._fetched_at = time.time()
+            self.refresh_count += 1
+
+    # ---------- Okuma API'si ----------
+    def tickers(self) -> List[dict]:
+        """Ham ticker listesi (get_ticker_24hr formati)."""
+        self._ensure_fresh()
+        return self._raw
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Sembolun normalize ticker'i (gerekirse snapshot yenilenir)."""
+        self._ensure_fresh()
+        return self._by_symbol.get(symbol)
+
+    def peek(self, symbol: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """Yenileme TETIKLEMEDEN, en fazla max_age sn yasindaki snapshot'tan oku."""
+        if not self._is_fresh(max_age):
+            return None
+        return self._by_symbol.get(symbol)
+
+    def volume_24h(self, symbol: str) -> Optional[float]:
+        """24h quote hacmi (yoksa base hacim); sembol snapshot'ta yoksa None."""
+        t = self.get(symbol)
+        if not t:
+            return None
+        return t['quote_volume'] if t['quote_volume'] is not None else t['volume']
+
+    def bid_ask(self, symbol: str, max_age: float):
+        """Taze (<= max_age sn) snapshot'taki (bid, ask); yoksa None.
+
+        Spread guard icin bayat fiyat kullanilmaz ve toplu yenileme de tetiklenmez
+        (tum-sembol cagrisinin weight'i tek sembolunkinden cok yuksek).
+        """
+        t = self.peek(symbol, max_age)
+        if not t or not t['bid'] or not t['ask']:
+            return None
+        return t['bid'], t['ask']
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        t = self.get(symbol)
+        return t['last'] if t else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fetched_at = 0.0
+
+
+_snapshots: Dict[Any, TickerSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_ticker_snapshot(api) -> TickerSnapshot:
+    """Market moduna gore paylasilan snapshot (ilk istekte verilen api ile kurulur)."""
+    key = (getattr(api, 'mode', None), bool(getattr(Settings, 'OFFLINE_MODE', False)))
+    with _snapshots_lock:
+        snap = _snapshots.get(key)
+        if snap is None:
+            snap = _snapshots[key] = TickerSnapshot(api)
+        return snap
+
+
+def reset_ticker_snapshots() -> None:
+    """Test/yeniden baglanma icin paylasilan snapshot'lari temizle."""
+    with _snapshots_lock:
+        _snapshots.clear()
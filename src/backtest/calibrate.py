@@ -41,131 +41,25 @@ def _iter_scores(df: pd.DataFrame, indicators_full: Dict, calc: IndicatorCalcula
     close_len = len(df)
     if close_len <= warmup_bars + 5:
         return []
-    scores: list[float] = []
-    for i in range(warmup_bars, close_len):
-        sub_inds = {}
-        for name, val in indicators_full.items():
-            if isinstance(val, pd.Series):
-                sub_inds[name] = val.iloc[: i + 1]
-            elif isinstance(val, dict):
-                inner = {}
-                for k, v in val.items():
-                    if isinstance(v, pd.Series):
-                        inner[k] = v.iloc[: i + 1]
-                    else:
-                        inner[k] = v
-                sub_inds[name] = inner
-            else:
-                sub_inds[name] = val
-        sub_df = df.iloc[: i + 1]
-        scored = calc.score_indicators(sub_df, sub_inds)
-        if adx_min is not None:
-            adx_val = scored.get('scores', {}).get('ADX')
-            try:
-                if adx_val is None or float(adx_val) < adx_min:
-                    continue  # dusuk ADX ortamini dagilima dahil etmiyoruz
-            except Exception:
-                pass
-        scores.append(scored['total_score'])
-    return scores
+    # Tum bar skorlari tek vektorize cagrida (per-bar prefix slice yerine)
+    series = calc.score_indicators_series(df, indicators_full)
+    scores = series['total_score'][warmup_bars:]
+    if adx_min is not None:
+        adx_arr = series['adx']
+        if adx_arr is None:
+            return []  # ADX yoksa filtre hicbir bari gecirmez (per-bar davranis)
+        # dusuk ADX ortamini dagilima dahil etmiyoruz (NaN ADX filtreye takilmaz)
+        scores = scores[~(adx_arr[warmup_bars:] < adx_min)]
+    return [float(x) for x in scores]
 
-def _simulate_trades(df: pd.DataFrame, indicators_full: Dict, calc: IndicatorCalculator,
-                     buy_thr: float, sell_thr: float, buy_exit: float, sell_exit: float,
-                     use_next_bar_fill: bool = False,
-                     commission_pct_per_side: float | None = None,
-                     slippage_pct_per_side: float | None = None,
-                     warmup_bars: int = DEFAULT_WARMUP_BARS,
-                     adx_min: float | None = None):
-    close_len = len(df)
-    # Esikler NaN ise direkt bos sonuc don
-    if any(isinstance(x, float) and math.isnan(x) for x in (buy_thr, sell_thr, buy_exit, sell_exit)):
-        return {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
-    if close_len <= warmup_bars + 5:
-        return {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
-    position = None
-    entry_price = None
-    trades = []
-    consec_losses = 0
-    max_consec_losses = 0
-    for i in range(warmup_bars, close_len):
-        sub_inds = {}
-        for name, val in indicators_full.items():
-            if isinstance(val, pd.Series):
-                sub_inds[name] = val.iloc[: i + 1]
-            elif isinstance(val, dict):
-                inner = {}
-                for k, v in val.items():
-                    if isinstance(v, pd.Series):
-                        inner[k] = v.iloc[: i + 1]
-                    else:
-                        inner[k] = v
-                sub_inds[name] = inner
-            else:
-                sub_inds[name] = val
-        sub_df = df.iloc[: i + 1]
-        scored = calc.score_indicators(sub_df, sub_inds)
-        score_val = scored['total_score']
-        adx_val = None
-        if adx_min is not None:
-            try:
-                adx_val = scored.get('scores', {}).get('ADX')
-                if adx_val is not None:
-                    adx_val = float(adx_val)
-            except Exception:
-                adx_val = None
-        price = float(sub_df['close'].iloc[-1])
-        if position == 'LONG':
-            if score_val < buy_exit or score_val <= sell_thr:
-                exit_price = price
-                if use_next_bar_fill and i + 1 < close_len:
-                    exit_price = float(df.iloc[i + 1]['open'])
-                pnl = (exit_price - entry_price) / entry_price * 100.0
-                trades.append(pnl)
-                if pnl < 0:
-                    consec_losses += 1
-                    max_consec_losses = max(max_consec_losses, consec_losses)
-                else:
-                    consec_losses = 0
-                position = None
-        elif position == 'SHORT':
-            if score_val > sell_exit or score_val >= buy_thr:
-                exit_price = price
-                if use_next_bar_fill and i + 1 < close_len:
-                    exit_price = float(df.iloc[i + 1]['open'])
-                pnl = (entry_price - exit_price) / entry_price * 100.0
-                trades.append(pnl)
-                if pnl < 0:
-                    consec_losses += 1
-                    max_consec_losses = max(max_consec_losses, consec_losses)
-                else:
-                    consec_losses = 0
-                position = None
-        if position is None:
-            # Dusuk ADX ortaminda yeni pozisyon acma
-            if adx_min is not None and adx_val is not None and adx_val < adx_min:
-                continue
-            if score_val >= buy_thr:
-                fill = price
-                if use_next_bar_fill and i + 1 < close_len:
-                    fill = float(df.iloc[i + 1]['open'])
-                position = 'LONG'
-                entry_price = fill
-            elif score_val <= sell_thr:
-                fill = price
-                if use_next_bar_fill and i + 1 < close_len:
-                    fill = float(df.iloc[i + 1]['open'])
-                position = 'SHORT'
-                entry_price = fill
-    if position and entry_price is not None:
-        last_price = float(df['close'].iloc[-1])
-        pnl = (last_price - entry_price) / entry_price * 100.0 if position == 'LONG' else (entry_price - last_price) / entry_price * 100.0
-        trades.append(pnl)
-        if pnl < 0:
-            consec_losses += 1
-            max_consec_losses = max(max_consec_losses, consec_losses)
+_EMPTY_SIM = {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
+
+def _summarize_trades(trades: list[float], max_consec_losses: int,
+                      commission_pct_per_side: float | None = None,
+                      slippage_pct_per_side: float | None = None) -> dict:
     total = len(trades)
     if not total:
-        return {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
+        return dict(_EMPTY_SIM)
     wins = [t for t in trades if t > 0]
     losses = [t for t in trades if t <= 0]
     winrate = len(wins)/total
@@ -184,9 +78,117 @@ def _simulate_trades(df: pd.DataFrame, indicators_full: Dict, calc: IndicatorCal
     expectancy_adj = winrate_adj * avg_gain_adj - (1 - winrate_adj) * avg_loss_adj
     return {'total_trades': total,'wins': len(wins),'losses': len(losses),'winrate': round(winrate*100,2),'avg_gain_pct': round(avg_gain,2),'avg_loss_pct': round(avg_loss,2),'expectancy_pct': round(expectancy,2),'max_consec_losses': int(max_consec_losses),'cost_per_round_pct': round(cost_per_round,4),'winrate_after_costs': round(winrate_adj*100,2),'expectancy_after_costs_pct': round(expectancy_adj,2)}
 
-def _simulate_for_symbol(dfetch: DataFetcher, calc: IndicatorCalculator, sym: str,
-                         buy: float, sell: float, be: float, se: float,
-                         warmup_bars: int) -> dict | None:
+def _score_matrix_row(df: pd.DataFrame, indicators_full: Dict, calc: IndicatorCalculator) -> dict:
+    """Esikten bagimsiz bar verisi: skor, kapanis, sonraki acilis ve ADX dizileri."""
+    series = calc.score_indicators_series(df, indicators_full)
+    close_arr = df['close'].to_numpy(dtype=float)
+    next_open = np.full(len(df), np.nan)
+    if len(df) > 1:
+        next_open[:-1] = df['open'].to_numpy(dtype=float)[1:]
+    return {'score': series['total_score'], 'close': close_arr, 'next_open': next_open, 'adx': series['adx']}
+
+def _simulate_candidates(row: dict, candidates: list[tuple[float, float, float, float]],
+                         use_next_bar_fill: bool = False,
+                         commission_pct_per_side: float | None = None,
+                         slippage_pct_per_side: float | None = None,
+                         warmup_bars: int = DEFAULT_WARMUP_BARS,
+                         adx_min: float | None = None) -> list[dict]:
+    """Ayni skor dizisi uzerinde tum (buy, sell, buy_exit, sell_exit) adaylarini birlikte simule eder.
+
+    Bar dongusu bir kez doner; pozisyon durumu aday ekseninde NumPy dizileri ile tutulur.
+    Her aday icin sonuc _simulate_trades ile birebir aynidir.
+    """
+    score_arr = row['score']
+    close_arr = row['close']
+    close_len = len(close_arr)
+    k = len(candidates)
+    if not k:
+        return []
+    if close_len <= warmup_bars + 5:
+        return [dict(_EMPTY_SIM) for _ in range(k)]
+    thr = np.array(candidates, dtype=float).reshape(k, 4)
+    buy_thr, sell_thr, buy_exit, sell_exit = thr[:, 0], thr[:, 1], thr[:, 2], thr[:, 3]
+    valid = ~np.isnan(thr).any(axis=1)
+    fill_arr = close_arr
+    if use_next_bar_fill:
+        fill_arr = row['next_open'].copy()
+        fill_arr[-1] = close_arr[-1]
+    adx_arr = row.get('adx') if adx_min is not None else None
+    position = np.zeros(k, dtype=np.int8)  # 1 LONG, -1 SHORT, 0 yok
+    entry_price = np.zeros(k)
+    consec_losses = np.zeros(k, dtype=np.int64)
+    max_consec_losses = np.zeros(k, dtype=np.int64)
+    trades: list[list[float]] = [[] for _ in range(k)]
+
+    def _book(mask: np.ndarray, pnl: np.ndarray) -> None:
+        for j in np.flatnonzero(mask):
+            trades[j].append(float(pnl[j]))
+        loss = mask & (pnl < 0)
+        consec_losses[loss] += 1
+        np.maximum(max_consec_losses, consec_losses, out=max_consec_losses)
+        consec_losses[mask & ~(pnl < 0)] = 0
+
+    for i in range(warmup_bars, close_len):
+        score_val = score_arr[i]
+        fill = fill_arr[i]
+        exit_long = (position == 1) & ((score_val < buy_exit) | (score_val <= sell_thr))
+        exit_short = (position == -1) & ((score_val > sell_exit) | (score_val >= buy_thr))
+        if exit_long.any() or exit_short.any():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pnl = np.where(exit_long, (fill - entry_price) / entry_price * 100.0,
+                               (entry_price - fill) / entry_price * 100.0)
+            exited = exit_long | exit_short
+            _book(exited, pnl)
+            position[exited] = 0
+        # Dusuk ADX ortaminda yeni pozisyon acma
+        if adx_arr is not None and adx_arr[i] < adx_min:
+            continue
+        flat = position == 0
+        go_long = flat & (score_val >= buy_thr)
+        go_short = flat & ~go_long & (score_val <= sell_thr)
+        position[go_long] = 1
+        position[go_short] = -1
+        entry_price[go_long | go_short] = fill
+    open_mask = position != 0
+    if open_mask.any():
+        last_price = close_arr[-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl = np.where(position == 1, (last_price - entry_price) / entry_price * 100.0,
+                           (entry_price - last_price) / entry_price * 100.0)
+        for j in np.flatnonzero(open_mask):
+            trades[j].append(float(pnl[j]))
+        loss = open_mask & (pnl < 0)
+        consec_losses[loss] += 1
+        np.maximum(max_consec_losses, consec_losses, out=max_consec_losses)
+    return [
+        _summarize_trades(trades[j], int(max_consec_losses[j]), commission_pct_per_side, slippage_pct_per_side)
+        if valid[j] else dict(_EMPTY_SIM)
+        for j in range(k)
+    ]
+
+def _simulate_trades(df: pd.DataFrame, indicators_full: Dict, calc: IndicatorCalculator,
+                     buy_thr: float, sell_thr: float, buy_exit: float, sell_exit: float,
+                     use_next_bar_fill: bool = False,
+                     commission_pct_per_side: float | None = None,
+                     slippage_pct_per_side: float | None = None,
+                     warmup_bars: int = DEFAULT_WARMUP_BARS,
+                     adx_min: float | None = None):
+    # Esikler NaN ise direkt bos sonuc don
+    if any(isinstance(x, float) and math.isnan(x) for x in (buy_thr, sell_thr, buy_exit, sell_exit)):
+        return dict(_EMPTY_SIM)
+    if len(df) <= warmup_bars + 5:
+        return dict(_EMPTY_SIM)
+    row = _score_matrix_row(df, indicators_full, calc)
+    return _simulate_candidates(
+        row, [(buy_thr, sell_thr, buy_exit, sell_exit)],
+        use_next_bar_fill=use_next_bar_fill,
+        commission_pct_per_side=commission_pct_per_side,
+        slippage_pct_per_side=slippage_pct_per_side,
+        warmup_bars=warmup_bars,
+        adx_min=adx_min
+    )[0]
+
+def _load_score_row(dfetch: DataFetcher, calc: IndicatorCalculator, sym: str) -> dict | None:
     try:
         df = dfetch.get_pair_data(sym, Settings.TIMEFRAME, auto_fetch=False)
         if df is None or df.empty or 'close' not in df.columns:
@@ -194,15 +196,23 @@ def _simulate_for_symbol(dfetch: DataFetcher, calc: IndicatorCalculator, sym: st
         df = df.sort_values('timestamp')
         df_slice = _slice_recent(df)
         indicators_full = _build_indicator_frames(df_slice, calc)
-        return _simulate_trades(
-            df_slice, indicators_full, calc,
-            buy, sell, be, se,
-            use_next_bar_fill=Settings.USE_NEXT_BAR_FILL,
-            warmup_bars=warmup_bars
-        )
+        return _score_matrix_row(df_slice, indicators_full, calc)
     except Exception:
         return None
 
+def _build_score_matrix(dfetch: DataFetcher, calc: IndicatorCalculator, symbols: list[str]) -> dict[str, dict]:
+    """Kalibrasyon kosusu icin sembol x bar skor matrisini bir kez hesaplar (esiklerden bagimsiz)."""
+    matrix: dict[str, dict] = {}
+    if not symbols:
+        return matrix
+    with ThreadPoolExecutor(max_workers=max(1, min(len(symbols), Settings.CALIB_PARALLEL_WORKERS))) as ex:
+        futures = {ex.submit(_load_score_row, dfetch, calc, sym): sym for sym in symbols}
+        for f in as_completed(futures):
+            row = f.result()
+            if row is not None:
+                matrix[futures[f]] = row
+    return matrix
+
 def _optimize_thresholds(dfetch: DataFetcher, calc: IndicatorCalculator, symbols: list[str],
                          suggested_buy: float, suggested_sell: float, buy_exit_suggest: float, sell_exit_suggest: float,
                          percentiles: dict, warmup_bars: int) -> list[dict]:
@@ -215,32 +225,32 @@ def _optimize_thresholds(dfetch: DataFetcher, calc: IndicatorCalculator, symbols
             if s is None: continue
             if b - s < 5: continue
             combos.append((b,s))
+    candidates = [(b, s, max(s + 1, b - 5), min(b - 1, s + 5)) for b, s in combos]
+    # Indikator/skorlar esiklerden bagimsiz: her sembol icin bir kez hesapla, tum adaylari ayni matris uzerinde degerlendir
+    matrix = _build_score_matrix(dfetch, calc, symbols[:20])
+    per_symbol = {
+        sym: _simulate_candidates(row, candidates, use_next_bar_fill=Settings.USE_NEXT_BAR_FILL, warmup_bars=warmup_bars)
+        for sym, row in matrix.items()
+    }
     results = []
-    symbols_use = symbols[:20]
-    for b, s in combos:
-        be = max(s + 1, b - 5)
-        se = min(b - 1, s + 5)
-        futures = []
-        with ThreadPoolExecutor(max_workers=min(len(symbols_use), Settings.CALIB_PARALLEL_WORKERS)) as ex:
-            for sym in symbols_use:
-                futures.append(ex.submit(_simulate_for_symbol, dfetch, calc, sym, b, s, be, se, warmup_bars))
-            global_wins = global_losses = global_trades = 0
-            expectancies = []
-            expectancies_after = []
-            wins_after_weighted = 0.0
-            max_consec = 0
-            for f in as_completed(futures):
-                sim_res = f.result()
-                if not sim_res: continue
-                global_trades += sim_res['total_trades']
-                global_wins += sim_res['wins']
-                global_losses += sim_res['losses']
-                expectancies.append(sim_res['expectancy_pct'])
-                expectancies_after.append(sim_res.get('expectancy_after_costs_pct', 0.0))
-                try:
-                    wins_after_weighted += (sim_res.get('winrate_after_costs', 0.0)/100.0) * sim_res['total_trades']
-                except Exception: pass
-                max_consec = max(max_consec, sim_res['max_consec_losses'])
+    for idx, (b, s, be, se) in enumerate(candidates):
+        global_wins = global_losses = global_trades = 0
+        expectancies = []
+        expectancies_after = []
+        wins_after_weighted = 0.0
+        max_consec = 0
+        for sims in per_symbol.values():
+            sim_res = sims[idx]
+            if not sim_res: continue
+            global_trades += sim_res['total_trades']
+            global_wins += sim_res['wins']
+            global_losses += sim_res['losses']
+            expectancies.append(sim_res['expectancy_pct'])
+            expectancies_after.append(sim_res.get('expectancy_after_costs_pct', 0.0))
+            try:
+                wins_after_weighted += (sim_res.get('winrate_after_costs', 0.0)/100.0) * sim_res['total_trades']
+            except Exception: pass
+            max_consec = max(max_consec, sim_res['max_consec_losses'])
         if global_trades == 0: continue
         winrate = (global_wins / global_trades * 100) if global_trades else 0.0
         expectancy_avg = float(np.mean(expectancies)) if expectancies else 0.0
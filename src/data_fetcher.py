@@ -1,13 +1,16 @@
 import json
 import os
+import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pandas as pd
 from config.settings import Settings
 
-from src.api.binance_api import BinanceAPI
+from src.api.binance_api import INTERVAL_MS, BinanceAPI
+from src.utils.frame_cache import FrameCache
 from src.utils.logger import get_logger
+from src.utils.ohlcv_store import STORE_SUFFIX, OhlcvStore
 from src.utils.structured_log import slog  # CR-0028 events
 
 
@@ -17,6 +20,10 @@ class DataFetcher:
         self.logger = get_logger("DataFetcher")
         self.data_path = Settings.DATA_PATH
         self.ensure_directories()
+        self._store: OhlcvStore | None = None
+        self._frame_cache = FrameCache(
+            getattr(Settings, 'PAIR_FRAME_CACHE_SIZE', 64), on_event=self._record_frame_cache_event
+        )
 
     def ensure_directories(self):
         """Gerekli dizinleri olustur"""
@@ -24,6 +31,76 @@ class DataFetcher:
         os.makedirs(f"{self.data_path}/processed", exist_ok=True)
         os.makedirs(f"{self.data_path}/logs", exist_ok=True)
 
+    # ---------------- Storage helpers -----------------
+    @property
+    def store(self) -> OhlcvStore:
+        """Ikili kolon bazli OHLCV deposu (data_path degisirse yeniden baglanir)."""
+        raw_dir = f"{self.data_path}/raw"
+        if self._store is None or self._store.raw_dir != raw_dir:
+            self._store = OhlcvStore(raw_dir)
+        return self._store
+
+    def _store_enabled(self) -> bool:
+        return bool(getattr(Settings, 'OHLCV_STORE_ENABLED', True))
+
+    def _csv_path(self, symbol, interval) -> str:
+        return f"{self.data_path}/raw/{symbol}_{interval}.csv"
+
+    def _pair_mtime(self, symbol, interval) -> float | None:
+        """Parite verisinin son guncellenme zamani (CSV veya store, hangisi yeniyse)."""
+        times = []
+        csv_path = self._csv_path(symbol, interval)
+        if os.path.exists(csv_path):
+            times.append(os.path.getmtime(csv_path))
+        if self._store_enabled():
+            store_m = self.store.mtime(symbol, interval)
+            if store_m is not None:
+                times.append(store_m)
+        return max(times) if times else None
+
+    def has_pair_data(self, symbol, interval="1h") -> bool:
+        return self._pair_mtime(symbol, interval) is not None
+
+    def _load_store_frame(self, symbol, interval):
+        """Store'dan oku; CSV store'dan yeniyse (ilk calisma / harici yazim) once migrate et."""
+        store_m = self.store.mtime(symbol, interval)
+        csv_path = self._csv_path(symbol, interval)
+        csv_m = os.path.getmtime(csv_path) if os.path.exists(csv_path) else None
+        if store_m is not None and (csv_m is None or store_m >= csv_m):
+            return self.store.read(symbol, interval)
+        if csv_m is None:
+            return None
+        df = self._read_csv_frame(symbol, interval)
+        if df is None or 'timestamp' not in df.columns:
+            return df
+        try:
+            self.store.write(symbol, interval, df)
+            self.logger.info(f"{symbol} CSV verisi ikili store'a tasindi ({len(df)} satir)")
+            return self.store.read(symbol, interval)
+        except Exception as e:
+            self.logger.warning(f"{symbol} store migrate hatasi: {e}")
+            return df
+
+    # ---------------- Frame cache -----------------
+    def _record_frame_cache_event(self, event: str) -> None:
+        metrics = getattr(self.api, 'metrics', None)
+        if metrics is not None and hasattr(metrics, 'record_frame_cache_event'):
+            metrics.record_frame_cache_event(event)
+
+    def invalidate_pair_cache(self, symbol=None, interval=None) -> None:
+        """Bellek ici frame cache'i temizle (symbol verilmezse tamami)."""
+        if symbol is None:
+            self._frame_cache.clear()
+        else:
+            self._frame_cache.invalidate((symbol, interval or "1h"))
+
+    def frame_cache_stats(self) -> dict:
+        return self._frame_cache.stats()
+
+    def migrate_csv_store(self, interval: str | None = None, force: bool = False) -> dict:
+        """Mevcut tum CSV'leri tek seferde ikili store'a tasir."""
+        return self.store.migrate_all(interval=interval, force=force)
+
     def update_top_pairs(self, limit: int | None = None):
         """Top N (varsayilan 150) parite listesini guncelle.
 
@@ -125,7 +202,10 @@ class DataFetcher:
                 pairs = []
         if not pairs:
             try:
-                pairs = [fn[:-len(file_suffix)] for fn in os.listdir(raw_dir) if fn.endswith(file_suffix)]
+                store_suffix = f"_{interval}{STORE_SUFFIX}"
+                names = os.listdir(raw_dir)
+                pairs = sorted({fn[:-len(file_suffix)] for fn in names if fn.endswith(file_suffix)}
+                               | {fn[:-len(store_suffix)] for fn in names if fn.endswith(store_suffix)})
             except Exception:
                 pairs = []
         # Pytest altinda test sembollerini zorunlu ekle (overwrite durumundan bagimsiz)
@@ -139,12 +219,11 @@ class DataFetcher:
         import time as _time
         now_ts = _time.time()
         for sym in pairs:
-            path = f"{raw_dir}/{sym}{file_suffix}"
-            if not os.path.exists(path):
-                result['stale'].append(sym)
-                continue
             try:
-                mtime_ts = os.path.getmtime(path)
+                mtime_ts = self._pair_mtime(sym, interval)
+                if mtime_ts is None:
+                    result['stale'].append(sym)
+                    continue
                 age_min = max(0.0, (now_ts - mtime_ts) / 60.0)
                 if age_min > max_age_minutes:
                     result['stale'].append(sym)
@@ -273,17 +352,59 @@ class DataFetcher:
             pairs = self.load_top_pairs(ensure=False)
         return pairs
 
-    def fetch_pair_data(self, symbol, days=30, interval="1h"):
-        """Belirli bir paritenin verilerini cek"""
-        try:
-            self.logger.info(f"{symbol} verileri cekiliyor...")
-            df = self.api.get_historical_data(symbol, interval, days)
+    def _delta_start_ms(self, symbol, interval, days) -> int | None:
+        """Delta fetch baslangici (ms): store'daki son bar; uygun degilse None (tam cekim).
 
-            # CSV dosyasina kaydet
-            file_path = f"{self.data_path}/raw/{symbol}_{interval}.csv"
-            df.to_csv(file_path, index=False)
+        Son bar dahil edilir; boylece henuz kapanmamis mum guncellenir ve store mtime'i
+        tazelenir (stale tespiti icin). Son bar pencereden (days*24 bar) eskiyse tam cekim
+        yapilir, aksi halde arada delik kalirdi.
+        """
+        if not (self._store_enabled() and getattr(Settings, 'KLINE_DELTA_FETCH_ENABLED', True)):
+            return None
+        if getattr(self.api, 'get_historical_data_since', None) is None:
+            return None
+        last_ts = self.store.last_timestamp(symbol, interval)
+        if last_ts is None or pd.isna(last_ts):
+            return None
+        last_ms = int(last_ts.value // 1_000_000)
+        step_ms = INTERVAL_MS.get(interval, 3_600_000)
+        window_start = int(time.time() * 1000) - days * 24 * step_ms
+        if last_ms < window_start:
+            return None
+        return last_ms
 
-            self.logger.info(f"{symbol} verileri kaydedildi: {file_path}")
+    def fetch_pair_data(self, symbol, days=30, interval="1h"):
+        """Belirli bir paritenin verilerini cek (store varsa yalnizca eksik barlar)"""
+        self.invalidate_pair_cache(symbol, interval)
+        try:
+            use_store = self._store_enabled()
+            start_ms = self._delta_start_ms(symbol, interval, days)
+            if start_ms is not None:
+                self.logger.info(f"{symbol} delta verileri cekiliyor (startTime={start_ms})...")
+                df = self.api.get_historical_data_since(symbol, interval, start_ms)
+            else:
+                self.logger.info(f"{symbol} verileri cekiliyor...")
+                df = self.api.get_historical_data(symbol, interval, days)
+
+            file_path = self._csv_path(symbol, interval)
+            if not use_store:
+                df.to_csv(file_path, index=False)
+                self.logger.info(f"{symbol} verileri kaydedildi: {file_path}")
+                return True
+            if start_ms is not None:
+                written = self.store.append(symbol, interval, df)
+                # Delta eklemeler store'u buyutur; eski tam cekim gibi days*24 barlik pencereyi koru
+                keep = days * 24
+                self.store.trim(symbol, interval, keep, slack=max(64, keep // 10))
+            else:
+                written = self.store.write(symbol, interval, df)
+            if getattr(Settings, 'OHLCV_CSV_MIRROR', False):
+                self.store.read(symbol, interval).to_csv(file_path, index=False)
+                # CSV aynasi store'dan yeni gorunmesin (aksi halde her okumada yeniden migrate edilir)
+                store_m = self.store.mtime(symbol, interval)
+                if store_m is not None:
+                    os.utime(file_path, (store_m, store_m))
+            self.logger.info(f"{symbol} verileri kaydedildi: {self.store.path(symbol, interval)} (+{written} bar)")
             return True
         except Exception as e:
             self.logger.error(f"{symbol} veri cekme hatasi: {e!s}")
@@ -303,7 +424,15 @@ class DataFetcher:
 
     # ---------------- Validation & Maintenance -----------------
     def _read_pair(self, symbol, interval):
-        path = f"{self.data_path}/raw/{symbol}_{interval}.csv"
+        if self._store_enabled():
+            try:
+                df = self._load_store_frame(symbol, interval)
+                if df is not None:
+                    return df
+            except Exception as e:
+                # _load_pair_frame gibi: store okunamazsa CSV'ye dus
+                self.logger.error(f"{symbol} store okunamadi: {e}")
+        path = self._csv_path(symbol, interval)
         if not os.path.exists(path):
             return None
         try:
@@ -325,14 +454,14 @@ class DataFetcher:
             self.logger.warning("Ham veri klasoru yok, atlaniyor")
             return False
 
-        csv_files = [f for f in os.listdir(raw_dir) if f.endswith(f"_{interval}.csv")]
-        if not csv_files:
+        suffixes = (f"_{interval}.csv", f"_{interval}{STORE_SUFFIX}")
+        pair_symbols = sorted({f[:-len(sfx)] for f in os.listdir(raw_dir) for sfx in suffixes if f.endswith(sfx)})
+        if not pair_symbols:
             self.logger.warning("Dogrulanacak CSV bulunamadi")
             return False
 
         ok = 0
-        for file in csv_files:
-            symbol = file.replace(f"_{interval}.csv", "")
+        for symbol in pair_symbols:
             df = self._read_pair(symbol, interval)
             if df is None:
                 self.logger.warning(f"{symbol}: okunamadi")
@@ -353,18 +482,52 @@ class DataFetcher:
                     self.fetch_pair_data(symbol, days=Settings.BACKTEST_DAYS, interval=interval)
             else:
                 ok += 1
-        self.logger.info(f"Veri dogrulama tamamlandi: {ok}/{len(csv_files)} temiz")
-        return ok == len(csv_files)
+        self.logger.info(f"Veri dogrulama tamamlandi: {ok}/{len(pair_symbols)} temiz")
+        return ok == len(pair_symbols)
 
     def get_pair_data(self, symbol, interval="1h", auto_fetch=True):
-        """Diskten parite verilerini yukle; yoksa cek ve normalize et"""
-        file_path = f"{self.data_path}/raw/{symbol}_{interval}.csv"
+        """Diskten parite verilerini yukle; yoksa cek ve normalize et.
 
+        Okunan frame (symbol, interval) anahtariyla LRU cache'te tutulur ve dosya mtime'i
+        degismedikce ayni nesne dondurulur; cagiranlar frame'i yerinde degistirmemeli.
+        """
+        mtime = self._pair_mtime(symbol, interval)
         # Eger veri yoksa cek
-        if not os.path.exists(file_path) and auto_fetch:
+        if auto_fetch and mtime is None:
             self.logger.warning(f"{symbol} verisi bulunamadi, cekiliyor...")
             if not self.fetch_pair_data(symbol, 30, interval):
                 return None
+            mtime = self._pair_mtime(symbol, interval)
+        if mtime is None or not self._frame_cache.enabled:
+            return self._load_pair_frame(symbol, interval)
+
+        key = (symbol, interval)
+        version = (self.data_path, mtime)
+        df = self._frame_cache.get(key, version)
+        if df is not None:
+            return df
+        df = self._load_pair_frame(symbol, interval)
+        # Version okumadan ONCE alinir; okuma sirasinda esanli bir fetch_pair_data
+        # eklediyse eski frame yeni version ile cache'lenmesin. Okumanin kendisi
+        # (CSV migrate/normalize) dosyayi degistirdiyse de sadece cache atlanir.
+        if self._pair_mtime(symbol, interval) == mtime:
+            self._frame_cache.put(key, version, df)
+        return df
+
+    def _load_pair_frame(self, symbol, interval):
+        if self._store_enabled():
+            try:
+                df = self._load_store_frame(symbol, interval)
+            except Exception as e:
+                self.logger.error(f"{symbol} store okunamadi: {e}")
+                df = None
+            if df is not None:
+                return df
+        return self._read_csv_frame(symbol, interval)
+
+    def _read_csv_frame(self, symbol, interval):
+        """CSV'yi oku; timestamp kolonu bozuksa normalize edip geri yaz."""
+        file_path = self._csv_path(symbol, interval)
 
         # Veriyi yukle
         if os.path.exists(file_path):
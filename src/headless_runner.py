@@ -22,6 +22,7 @@ from src.data_fetcher import DataFetcher
 from src.trader.core import Trader
 from src.utils.feature_flags import flag_enabled
 from src.utils.logger import get_logger
+from src.utils.ohlcv_store import is_pair_data_file
 from src.utils.structured_log import slog
 from src.utils.threshold_cache import get_threshold_cache
 
@@ -108,7 +109,7 @@ class HeadlessRunner:
         if Settings.OFFLINE_MODE:
             # In offline mode, we need historical data to exist
             raw_path = os.path.join(Settings.DATA_PATH, 'raw')
-            if not os.path.exists(raw_path) or not any(name.endswith('.csv') for name in os.listdir(raw_path)):
+            if not os.path.exists(raw_path) or not any(is_pair_data_file(name) for name in os.listdir(raw_path)):
                 problems.append('OFFLINE_MODE enabled but no historical data found')
 
         if problems:
@@ -165,7 +166,7 @@ class HeadlessRunner:
 
             if not Settings.OFFLINE_MODE:
                 # Check if we need initial data fetch
-                if not any(name.endswith('.csv') for name in os.listdir(raw_path)):
+                if not any(is_pair_data_file(name) for name in os.listdir(raw_path)):
                     self.logger.info('No historical data found. Fetching initial data...')
                     fetcher.fetch_all_pairs_data(days=Settings.BACKTEST_DAYS, interval=Settings.TIMEFRAME)
                     self.logger.info('Initial data fetch complete')
@@ -0,0 +1,499 @@
+"""
+Stateful (artimli) indikator motoru.
+
+IndicatorCalculator.calculate_all_indicators her sinyal turunda tum DataFrame
+uzerinde `ta` indikatorlerini bastan hesaplar. Bu modul (symbol, timeframe)
+basina indikator state'i tutar ve her yeni kapanan bar icin her indikatoru
+sabit maliyetle (pencere boyu kadar) gunceller; ilk cagri gecmisi yeniden
+oynatarak state'i tohumlar.
+
+Uretilen degerler `ta` 0.10.x batch ciktisini (warmup NaN / 0 davranisi dahil)
+tolerans icinde birebir takip eder. Bilinen tek fark: ADX bilesenlerinde
+ara NaN'lar batch yolda bfill ile *gelecekteki* degerle doldurulur; burada
+yalnizca ffill uygulanir (son bar icin sonuc aynidir).
+
+Son satir her zaman "gecici" kabul edilir (Binance'in hala olusan mumu):
+state'e islenmez, kopya state uzerinde hesaplanir. Bir sonraki cagrida ayni
+timestamp gelirse yeniden hesaplanir, yeni bar gelirse kesinlesip islenir.
+
+Maliyetler:
+- Gosterge guncellemesi yeni bar basina sabittir (pencere boyu kadar).
+- Sonuc sozlugu hala len(df) boyutlu seriler kopyalar (O(len(df)) memcpy,
+  Python dongusu yok); frame boyu get_pair_data tarafinda sinirlidir.
+- Frame bastan kirpilirsa (kayan pencere) state korunur; ilk satirlar batch
+  yoldaki gibi yeniden warmup'a girmez, gecmisten tasinan degeri gosterir.
+- Gecmis yeniden yazilirsa (son kesin bar frame'de yok / degismis) veya ilk
+  cagri: tum frame saf Python dongusuyle yeniden oynatilir (~bar basina
+  onlarca mikrosaniye). Bu, tek seferlik batch ta hesabi mertebesindedir.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.frame_cache import FrameCache
+from src.utils.logger import get_logger
+
+logger = get_logger("IncrementalIndicators")
+
+_NAN = float("nan")
+_INF = float("inf")
+
+
+def _div(a: float, b: float) -> float:
+    """IEEE bolme (numpy/pandas gibi): x/0 -> +-inf, 0/0 ve nan/0 -> nan."""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if math.isnan(a) or a == 0:
+            return _NAN
+        return math.copysign(_INF, a) * math.copysign(1.0, b)
+
+
+class _Ewm:
+    """pandas ewm(adjust=False, min_periods=...).mean() ile ayni ozyineleme."""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.old_wt = 1.0 - alpha
+        self.min_periods = min_periods
+        self.value: Optional[float] = None
+        self.nobs = 0
+
+    def update(self, x: float) -> float:
+        if math.isnan(x):
+            # Yalnizca bastaki NaN'lar beklenir (MACD sinyal hatti); state degismez
+            return self.output()
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = (self.old_wt * self.value + self.alpha * x) / (self.old_wt + self.alpha)
+        self.nobs += 1
+        return self.output()
+
+    def output(self) -> float:
+        if self.value is None or self.nobs < self.min_periods:
+            return _NAN
+        return self.value
+
+
+class _Updater:
+    """Tek indikator icin state; update() kolon degerlerini tuple olarak dondurur."""
+
+    # (sonuc sozlugu anahtari, alt anahtar veya None)
+    columns: Tuple[Tuple[str, Optional[str]], ...] = ()
+    min_bars = 1
+
+    def update(self, high: float, low: float, close: float) -> tuple:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def clone(self) -> "_Updater":
+        dup = object.__new__(type(self))
+        for k, v in vars(self).items():
+            if isinstance(v, deque):
+                copied = deque(v, maxlen=v.maxlen)
+            elif isinstance(v, _Ewm):
+                copied = object.__new__(_Ewm)
+                copied.__dict__.update(v.__dict__)
+            elif isinstance(v, list):
+                copied = list(v)
+            else:
+                copied = v
+            setattr(dup, k, copied)
+        return dup
+
+
+class _RSI(_Updater):
+    def __init__(self, name: str, window: int):
+        self.columns = ((name, None),)
+        self.up = _Ewm(1.0 / window, window)
+        self.down = _Ewm(1.0 / window, window)
+        self.prev_close: Optional[float] = None
+
+    def update(self, _high, _low, close):
+        diff = _NAN if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        emaup = self.up.update(diff if diff > 0 else 0.0)
+        emadn = self.down.update(-diff if diff < 0 else 0.0)
+        if emadn == 0:
+            return (100.0,)
+        return (100 - (100 / (1 + _div(emaup, emadn))),)
+
+
+class _EMA(_Updater):
+    def __init__(self, name: str, window: int):
+        self.columns = ((name, None),)
+        self.ema = _Ewm(2.0 / (1.0 + window), window)
+
+    def update(self, _high, _low, close):
+        return (self.ema.update(close),)
+
+
+class _MACD(_Updater):
+    def __init__(self, name: str, fast: int, slow: int, sign: int):
+        self.columns = ((name, 'macd'), (name, 'signal'), (name, 'histogram'))
+        self.fast = _Ewm(2.0 / (1.0 + fast), fast)
+        self.slow = _Ewm(2.0 / (1.0 + slow), slow)
+        self.sign = _Ewm(2.0 / (1.0 + sign), sign)
+
+    def update(self, _high, _low, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.sign.update(macd)
+        return (macd, signal, macd - signal)
+
+
+class _Bollinger(_Updater):
+    def __init__(self, name: str, window: int, dev: float):
+        self.columns = ((name, 'upper'), (name, 'middle'), (name, 'lower'))
+        self.window = window
+        self.dev = dev
+        self.values: deque = deque(maxlen=window)
+
+    def update(self, _high, _low, close):
+        self.values.append(close)
+        if len(self.values) < self.window:
+            return (_NAN, _NAN, _NAN)
+        mavg = sum(self.values) / self.window
+        mstd = math.sqrt(sum((v - mavg) ** 2 for v in self.values) / self.window)
+        return (mavg + self.dev * mstd, mavg, mavg - self.dev * mstd)
+
+
+class _Stochastic(_Updater):
+    def __init__(self, name: str, window: int, smooth: int):
+        self.columns = ((name, 'slowk'), (name, 'slowd'))
+        self.window = window
+        self.smooth = smooth
+        self.highs: deque = deque(maxlen=window)
+        self.lows: deque = deque(maxlen=window)
+        self.ks: deque = deque(maxlen=smooth)
+
+    def update(self, high, low, close):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.highs) < self.window:
+            k = _NAN
+        else:
+            smin = min(self.lows)
+            k = _div(100 * (close - smin), max(self.highs) - smin)
+        self.ks.append(k)
+        if len(self.ks) < self.smooth or any(math.isnan(v) for v in self.ks):
+            return (k, _NAN)
+        return (k, sum(self.ks) / self.smooth)
+
+
+class _WilliamsR(_Updater):
+    def __init__(self, name: str, lbp: int):
+        self.columns = ((name, None),)
+        self.lbp = lbp
+        self.highs: deque = deque(maxlen=lbp)
+        self.lows: deque = deque(maxlen=lbp)
+
+    def update(self, high, low, close):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.highs) < self.lbp:
+            return (_NAN,)
+        hh = max(self.highs)
+        return (_div(-100 * (hh - close), hh - min(self.lows)),)
+
+
+class _CCI(_Updater):
+    def __init__(self, name: str, window: int, constant: float = 0.015):
+        self.columns = ((name, None),)
+        self.window = window
+        self.constant = constant
+        self.typical: deque = deque(maxlen=window)
+
+    def update(self, high, low, close):
+        tp = (high + low + close) / 3.0
+        self.typical.append(tp)
+        if len(self.typical) < self.window:
+            return (_NAN,)
+        mean = sum(self.typical) / self.window
+        mad = sum(abs(v - mean) for v in self.typical) / self.window
+        return (_div(tp - mean, self.constant * mad),)
+
+
+class _ATR(_Updater):
+    def __init__(self, name: str, window: int):
+        self.columns = ((name, None),)
+        self.min_bars = window  # batch yol daha kisa seride IndexError ile ATR'yi atlar
+        self.window = window
+        self.prev_close: Optional[float] = None
+        self.count = 0
+        self.tr_sum = 0.0
+        self.atr = 0.0
+
+    def update(self, high, low, close):
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+        if self.count < self.window:
+            self.tr_sum += tr
+            return (0.0,)
+        if self.count == self.window:
+            self.atr = (self.tr_sum + tr) / self.window
+        else:
+            self.atr = (self.atr * (self.window - 1) + tr) / float(self.window)
+        return (self.atr,)
+
+
+class _ADX(_Updater):
+    """ta.trend.ADXIndicator'in dizi indeks kaymalari dahil bar bazli karsiligi."""
+
+    def __init__(self, name: str, window: int):
+        self.columns = ((name, 'adx'), (name, 'plus_di'), (name, 'minus_di'))
+        self.min_bars = 2 * window  # batch yol daha kisa seride ADX'i atlar
+        self.window = window
+        self.prev: Optional[Tuple[float, float, float]] = None
+        self.count = 0
+        self.trs = 0.0
+        self.dip = 0.0
+        self.din = 0.0
+        self.dx_seed: list = []
+        self.adx = 0.0
+        # ffill icin son gecerli ciktilar (batch yoldaki inf/NaN sanitizasyonu)
+        self.last_valid = [_NAN, _NAN, _NAN]
+
+    def update(self, high, low, close):
+        j = self.count  # bu barin indeksi
+        self.count += 1
+        prev = self.prev
+        self.prev = (high, low, close)
+        w = self.window
+        if prev is None:
+            return self._sanitize(0.0, 0.0, 0.0)
+        p_high, p_low, p_close = prev
+        ddm = max(high, p_close) - min(low, p_close)
+        diff_up = high - p_high
+        diff_down = p_low - low
+        pos = abs(diff_up) if (diff_up > diff_down and diff_up > 0) else 0.0
+        neg = abs(diff_down) if (diff_down > diff_up and diff_down > 0) else 0.0
+        if j <= w:
+            self.trs += ddm
+            self.dip += pos
+            self.din += neg
+        else:
+            self.trs = self.trs - (self.trs / float(w)) + ddm
+            self.dip = self.dip - (self.dip / float(w)) + pos
+            self.din = self.din - (self.din / float(w)) + neg
+        if j < w:
+            return self._sanitize(0.0, 0.0, 0.0)
+
+        di_pos = 100 * _div(self.dip, self.trs)
+        di_neg = 100 * _div(self.din, self.trs)
+        dx = 100 * abs(_div(di_pos - di_neg, di_pos + di_neg))
+        if j < 2 * w - 1:
+            self.dx_seed.append(dx)
+            adx = 0.0
+        elif j == 2 * w - 1:
+            self.dx_seed.append(dx)
+            self.adx = float(np.asarray(self.dx_seed, dtype=float).mean())
+            self.dx_seed = []
+            adx = self.adx
+        else:
+            self.adx = ((self.adx * (w - 1)) + dx) / float(w)
+            adx = self.adx
+        if j == w:
+            # ta adx_pos/adx_neg dongusu ilk state indeksini atlar
+            return self._sanitize(adx, 0.0, 0.0)
+        return self._sanitize(adx, di_pos, di_neg)
+
+    def _sanitize(self, *vals):
+        out = []
+        for i, v in enumerate(vals):
+            if math.isfinite(v):
+                self.last_valid[i] = v
+            out.append(self.last_valid[i])
+        return tuple(out)
+
+
+def build_updaters(indicators_config: dict) -> List[_Updater]:
+    """indicators.json konfigurasyonundan updater listesi (batch yol ile ayni parametreler)."""
+    updaters: List[_Updater] = []
+    for ic in indicators_config.get('indicators', []):
+        name = ic.get('name')
+        params = ic.get('params', {})
+        if name == "RSI":
+            updaters.append(_RSI(name, params.get('timeperiod', 14)))
+        elif name == "MACD":
+            updaters.append(_MACD(name, params.get('fastperiod', 12), params.get('slowperiod', 26),
+                                  params.get('signalperiod', 9)))
+        elif name == "Bollinger Bands":
+            updaters.append(_Bollinger(name, params.get('timeperiod', 20), params.get('nbdevup', 2)))
+        elif name == "Stochastic":
+            updaters.append(_Stochastic(name, params.get('fastk_period', 14), params.get('slowk_period', 3)))
+        elif name == "Williams %R":
+            updaters.append(_WilliamsR(name, params.get('timeperiod', 14)))
+        elif name == "CCI":
+            updaters.append(_CCI(name, params.get('timeperiod', 20)))
+        elif name == "ATR":
+            updaters.append(_ATR(name, params.get('timeperiod', 14)))
+        elif name == "EMA":
+            updaters.append(_EMA(name, params.get('timeperiod', 50)))
+        elif name == "ADX":
+            updaters.append(_ADX(name, params.get('timeperiod', 14)))
+    return updaters
+
+
+class IncrementalIndicatorState:
+    """Tek (symbol, timeframe) icin state + kesinlesmis bar ciktilari.
+
+    Ciktilar 2D numpy tamponunda tutulur (satir = bar, kolon = seri). Tampon
+    son frame boyunun ~2 katini asinca eski satirlar atilir; bellek ve sonuc
+    kopyalama maliyeti len(df) ile sinirlidir, tum oturum gecmisiyle degil.
+    """
+
+    def __init__(self, indicators_config: dict, capacity: int = 1024):
+        self._config = indicators_config
+        self.updaters = build_updaters(indicators_config)
+        self.columns: List[Tuple[str, Optional[str]]] = [c for u in self.updaters for c in u.columns]
+        self.min_bars = max([u.min_bars for u in self.updaters] or [1])
+        self._buf = np.empty((max(int(capacity), 2), len(self.columns)), dtype=float)
+        self.n = 0  # tamponda tutulan kesinlesmis bar sayisi
+        self.last_ts: Any = None
+        self.last_close: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        self.updaters = build_updaters(self._config)
+        self.n = 0
+        self.last_ts = None
+        self.last_close = None
+
+    def _ensure_capacity(self, rows: int, keep: int) -> None:
+        """rows satira yer ac; gerekirse yalnizca son `keep` kesin satiri tutarak sikistir."""
+        if rows <= self._buf.shape[0]:
+            return
+        drop = max(0, self.n - keep)
+        if drop and rows - drop <= self._buf.shape[0]:
+            self._buf[:self.n - drop] = self._buf[drop:self.n]
+            self.n -= drop
+            return
+        live = self.n - drop
+        cap = self._buf.shape[0]
+        while cap < rows - drop:
+            cap *= 2
+        grown = np.empty((cap, self._buf.shape[1]), dtype=float)
+        grown[:live] = self._buf[drop:self.n]
+        self._buf = grown
+        self.n = live
+
+    @staticmethod
+    def _row(updaters, high, low, close) -> list:
+        row: list = []
+        for u in updaters:
+            row.extend(u.update(high, low, close))
+        return row
+
+    def locate(self, timestamps, closes) -> Optional[int]:
+        """Son kesin barin frame icindeki konumu; frame gecmisin devami degilse None.
+
+        Frame bastan kirpilmis (kayan pencere) olabilir; yeter ki son kesin bar
+        ayni degerle bulunsun ve ondan onceki frame satirlari tamponda olsun.
+        """
+        if self.n == 0:
+            return -1
+        pos = int(np.searchsorted(timestamps, self.last_ts, side="left"))
+        if pos >= len(timestamps) - 1 or pos + 1 > self.n:
+            return None
+        if timestamps[pos] != self.last_ts or closes[pos] != self.last_close:
+            return None
+        return pos
+
+    def advance(self, highs, lows, closes, timestamps, pos: int) -> None:
+        """pos sonrasindaki satirlari (son satir haric) isle; son satiri gecici hesapla."""
+        total = len(closes)
+        start = pos + 1
+        new_rows = total - start
+        self._ensure_capacity(self.n + new_rows, keep=total)
+        if new_rows > 1:
+            h = highs[start:total - 1].tolist()
+            lo = lows[start:total - 1].tolist()
+            c = closes[start:total - 1].tolist()
+            buf = self._buf
+            base = self.n
+            for i in range(len(c)):
+                buf[base + i] = self._row(self.updaters, h[i], lo[i], c[i])
+            self.n = base + len(c)
+            self.last_ts = timestamps[total - 2]
+            self.last_close = closes[total - 2]
+        tentative = [u.clone() for u in self.updaters]
+        self._buf[self.n] = self._row(tentative, float(highs[-1]), float(lows[-1]), float(closes[-1]))
+
+    def results(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """calculate_all_indicators ile ayni sekilde sozluk (seriler df.index ile hizali).
+
+        Seriler tamponun son len(df) satirinin kopyasidir (O(len(df)) memcpy);
+        cagiranlar sonucu tutsa bile sonraki guncellemeler onu degistirmez.
+        """
+        rows = len(df)
+        end = self.n + 1
+        out: Dict[str, Any] = {'close': df['close']}
+        for k, (name, sub) in enumerate(self.columns):
+            series = pd.Series(self._buf[end - rows:end, k].copy(), index=df.index)
+            if sub is None:
+                out[name] = series
+            else:
+                out.setdefault(name, {})[sub] = series
+        return out
+
+
+class IncrementalIndicatorEngine:
+    """(symbol, timeframe) basina IncrementalIndicatorState tutan LRU sarmalayici."""
+
+    def __init__(self, indicators_config: dict, max_states: int = 512):
+        self.indicators_config = indicators_config
+        self._states = FrameCache(max_entries=max_states)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._states.enabled
+
+    def calculate(self, key, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """df icin indikator sozlugu; uygun degilse None (cagiran batch yola duser)."""
+        if not self.enabled or df is None or df.empty:
+            return None
+        if 'timestamp' in df.columns:
+            timestamps = df['timestamp'].to_numpy()
+        else:
+            timestamps = df.index.to_numpy()
+        with self._lock:
+            state = self._states.get(key, None)
+            if state is None:
+                state = IncrementalIndicatorState(self.indicators_config, capacity=2 * len(df) + 256)
+                self._states.put(key, None, state)
+        if len(df) < state.min_bars:
+            return None
+        highs = df['high'].to_numpy(dtype=float)
+        lows = df['low'].to_numpy(dtype=float)
+        closes = df['close'].to_numpy(dtype=float)
+        with state.lock:
+            try:
+                pos = state.locate(timestamps, closes)
+                if pos is None:
+                    # Gecmis yeniden yazilmis / frame daha eskiye uzaniyor: tum frame'i yeniden oynat
+                    logger.debug(f"{key}: frame gecmisle hizali degil, state yeniden tohumlaniyor")
+                    state.reset()
+                    pos = -1
+                state.advance(highs, lows, closes, timestamps, pos)
+                return state.results(df)
+            except Exception as e:
+                logger.warning(f"{key}: artimli indikator hatasi, batch yola dusuluyor: {e}")
+                state.reset()
+                return None
+
+    def invalidate(self, key) -> None:
+        self._states.invalidate(key)
+
+    def clear(self) -> None:
+        self._states.clear()
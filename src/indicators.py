@@ -1,4 +1,5 @@
 import json
+import threading
 import warnings
 
 import numpy as np
@@ -12,11 +13,34 @@ from ta.volatility import AverageTrueRange, BollingerBands
 class IndicatorCalculator:
     def __init__(self):
         self.indicators_config = self.load_config()
+        self._incremental = None
+        self._incremental_lock = threading.Lock()
 
     def load_config(self):
         with open(Settings.INDICATORS_CONFIG, "r") as f:
             return json.load(f)
 
+    def calculate_all_indicators_incremental(self, df: pd.DataFrame, key):
+        """calculate_all_indicators'in (symbol, timeframe) state'li karsiligi.
+
+        Ayni anahtar icin art arda gelen (buyuyen) frame'lerde yalnizca yeni barlar
+        islenir. Motor kapaliysa, seri cok kisaysa veya hata olursa batch yola duser.
+        """
+        if getattr(Settings, 'INCREMENTAL_INDICATORS_ENABLED', False):
+            if self._incremental is None:
+                # Paralel sinyal dongusunde ayni anda ilk cagri: tek motor kurulsun
+                with self._incremental_lock:
+                    if self._incremental is None:
+                        from src.incremental_indicators import IncrementalIndicatorEngine
+                        self._incremental = IncrementalIndicatorEngine(
+                            self.indicators_config,
+                            max_states=getattr(Settings, 'INCREMENTAL_INDICATOR_STATES', 512),
+                        )
+            results = self._incremental.calculate(key, df)
+            if results is not None:
+                return results
+        return self.calculate_all_indicators(df)
+
     def calculate_all_indicators(self, df: pd.DataFrame):
         """
         Calculate all technical indicators for the given DataFrame.
@@ -276,6 +300,144 @@ class IndicatorCalculator:
             'signal': self.get_signal(final_score)
         }
 
+    def score_indicators_series(self, df: pd.DataFrame, indicators: dict):
+        """score_indicators mantiginin tum seri uzerinde vektorize hali.
+
+        Her bar i icin sonuc, score_indicators(df.iloc[:i+1], prefix_indikatorler)
+        ile ayni sayiyi uretir (NaN davranisi dahil); boylece kalibrasyon her bar
+        icin prefix slice + Python cagrisi yapmak zorunda kalmaz.
+
+        Returns:
+            dict: {'total_score': np.ndarray, 'scores': {isim: np.ndarray}, 'adx': np.ndarray | None}
+        """
+        n = len(df)
+        price = df['close'].to_numpy(dtype=float)
+        price_floor = np.maximum(price, 1e-12)
+
+        def arr(val):
+            return np.asarray(val, dtype=float).reshape(-1)[:n]
+
+        base_weights = {
+            'MACD': 1.3,
+            'EMA': 1.1,
+            'RSI': 1.0,
+            'Bollinger Bands': 0.9,
+            'Oscillator': 0.9,
+            'CCI': 0.6,
+            'ADX': 0.0
+        }
+        neutral = np.full(n, 50.0)
+        atr_pct = None
+        if 'ATR' in indicators:
+            try:
+                atr_pct = arr(indicators['ATR']) / price_floor
+            except Exception:
+                atr_pct = None
+
+        component_scores: dict[str, np.ndarray] = {}
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            if 'MACD' in indicators:
+                try:
+                    hist = arr(indicators['MACD']['histogram'])
+                    scale = np.ones(n)
+                    if atr_pct is not None:
+                        scale = np.where(atr_pct > 0, np.clip(1.0 / (atr_pct * 10), 0.5, 3.0), 1.0)
+                    component_scores['MACD'] = np.clip(50 + 50 * np.tanh(hist * scale), 0, 100)
+                except Exception:
+                    component_scores['MACD'] = neutral.copy()
+            if 'EMA' in indicators:
+                try:
+                    diff = (price - arr(indicators['EMA'])) / price_floor
+                    component_scores['EMA'] = np.clip(50 + 50 * np.tanh(diff * 5), 0, 100)
+                except Exception:
+                    component_scores['EMA'] = neutral.copy()
+            if 'RSI' in indicators:
+                try:
+                    component_scores['RSI'] = np.clip(arr(indicators['RSI']), 0, 100)
+                except Exception:
+                    component_scores['RSI'] = neutral.copy()
+            if 'Bollinger Bands' in indicators:
+                try:
+                    upper = arr(indicators['Bollinger Bands']['upper'])
+                    lower = arr(indicators['Bollinger Bands']['lower'])
+                    band = np.maximum(upper - lower, 1e-12)
+                    pos = np.clip((price - lower) / band, 0, 1)
+                    squeeze = band / price_floor
+                    base = np.where(squeeze < 0.01, 50 + (pos - 0.5) * 40, pos * 100)
+                    component_scores['Bollinger Bands'] = np.clip(base, 0, 100)
+                except Exception:
+                    component_scores['Bollinger Bands'] = neutral.copy()
+            if 'Stochastic' in indicators or 'Williams %R' in indicators:
+                osc_vals = []
+                try:
+                    if 'Stochastic' in indicators:
+                        osc_vals.append(np.clip(arr(indicators['Stochastic']['slowk']), 0, 100))
+                except Exception:
+                    pass
+                try:
+                    if 'Williams %R' in indicators:
+                        osc_vals.append(np.clip(100 + arr(indicators['Williams %R']), 0, 100))
+                except Exception:
+                    pass
+                if osc_vals:
+                    total = osc_vals[0]
+                    for v in osc_vals[1:]:
+                        total = total + v
+                    component_scores['Oscillator'] = total / len(osc_vals)
+                else:
+                    component_scores['Oscillator'] = neutral.copy()
+            if 'CCI' in indicators:
+                try:
+                    component_scores['CCI'] = np.clip(50 + (arr(indicators['CCI']) / 250) * 50, 0, 100)
+                except Exception:
+                    component_scores['CCI'] = neutral.copy()
+            if 'ADX' in indicators:
+                try:
+                    component_scores['ADX'] = np.clip(arr(indicators['ADX']['adx']), 0, 100)
+                except Exception:
+                    component_scores['ADX'] = neutral.copy()
+
+            # ADX rejimine gore bar bazli agirliklar (NaN ADX -> taban agirliklar)
+            adx_level = component_scores.get('ADX')
+            weak = adx_level < 20 if adx_level is not None else np.zeros(n, dtype=bool)
+            strong = adx_level > 35 if adx_level is not None else np.zeros(n, dtype=bool)
+            regime_mult = {
+                'MACD': (0.7, 1.2),
+                'EMA': (0.7, 1.1),
+                'Bollinger Bands': (1.2, 0.85),
+                'Oscillator': (1.1, 0.9),
+            }
+            w_sum = np.zeros(n)
+            w_total = np.zeros(n)
+            for name, val in component_scores.items():
+                w_base = base_weights.get(name, 1.0)
+                if name in regime_mult:
+                    weak_m, strong_m = regime_mult[name]
+                    w = np.where(weak, w_base * weak_m, np.where(strong, w_base * strong_m, w_base))
+                else:
+                    w = np.full(n, w_base)
+                w_sum = w_sum + val * w
+                w_total = w_total + w
+            core_score = np.where(w_total != 0, w_sum / np.where(w_total != 0, w_total, 1.0), 50.0)
+
+            # ATR ceza: NaN ATR -> ceza yok (skaler yoldaki max/min davranisi)
+            risk_multiplier = np.ones(n)
+            if atr_pct is not None:
+                raw = (atr_pct - 0.01) * (0.30 / 0.04)
+                penalty = np.where(raw > 0, raw, 0.0)
+                penalty = np.where(penalty < 0.30, penalty, 0.30)
+                risk_multiplier = 1.0 - penalty
+            final_score = core_score * risk_multiplier
+
+        out_scores = dict(component_scores)
+        if 'ATR' in indicators:
+            out_scores['ATR_RiskMult'] = risk_multiplier * 100
+        return {
+            'scores': out_scores,
+            'total_score': final_score,
+            'adx': component_scores.get('ADX')
+        }
+
     def get_signal(self, score: float) -> str:
         """
         Determine the trading signal based on the overall score.
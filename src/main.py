@@ -14,6 +14,7 @@ from src.trader.core import Trader
 from src.ui.main_window import MainWindow
 from src.utils.feature_flags import flag_enabled
 from src.utils.logger import get_logger, get_logger as _get_global_logger
+from src.utils.ohlcv_store import is_pair_data_file
 from src.utils.structured_log import slog
 from src.utils.threshold_cache import get_threshold_cache
 
@@ -26,8 +27,8 @@ def ensure_data():
     raw_path = os.path.join(Settings.DATA_PATH, 'raw')
     os.makedirs(raw_path, exist_ok=True)
 
-    # Eger hic CSV yoksa toplu indirme yap
-    if not any(name.endswith('.csv') for name in os.listdir(raw_path)):
+    # Eger hic parite verisi (CSV veya store) yoksa toplu indirme yap
+    if not any(is_pair_data_file(name) for name in os.listdir(raw_path)):
         logger = get_logger("Main")
         logger.info('No historical data found. Fetching all pairs data (first run)...')
         fetcher.fetch_all_pairs_data(days=Settings.BACKTEST_DAYS, interval=Settings.TIMEFRAME)
@@ -6,6 +6,7 @@ for adaptive trading strategy optimization.
 """
 
 import logging
+import math
 import time
 from collections import deque
 from dataclasses import dataclass
@@ -92,6 +93,122 @@ class RegimeDetection:
         return self.confidence > 0.7 and self.metrics.regime_stability > 0.6
 
 
+# Kayan toplamlarin float birikim hatasini sinirlamak icin periyodik tam yeniden hesap
+_RESYNC_EVERY = 1024
+
+
+class _Ring:
+    """Onceden ayrilmis numpy halka tampon.
+
+    Degerler cift yazilir (j ve j+capacity), boylece son n deger her zaman bitisik bir
+    view'dir (kopya yok). Indeksleme eski deque arayuzunu korur: ring[i] -> (deger, ts).
+    """
+
+    __slots__ = ('_buf', '_count', '_ts', 'capacity')
+
+    def __init__(self, capacity: int, with_timestamps: bool = True):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(2 * self.capacity)
+        self._ts = np.zeros(self.capacity) if with_timestamps else None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, value: float, timestamp: float = 0.0) -> None:
+        j = self._count % self.capacity
+        self._buf[j] = value
+        self._buf[j + self.capacity] = value
+        if self._ts is not None:
+            self._ts[j] = timestamp
+        self._count += 1
+
+    def back(self, k: int) -> float:
+        """Sondan k. deger (0 = son eklenen); view olusturmadan."""
+        return float(self._buf[(self._count - 1 - k) % self.capacity])
+
+    def tail(self, n: Optional[int] = None) -> np.ndarray:
+        """Son n degerin (varsayilan: hepsi) salt okunur view'i."""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        if n <= 0:
+            return self._buf[:0]
+        end = (self._count - 1) % self.capacity + 1 + self.capacity
+        return self._buf[end - n:end]
+
+    def __getitem__(self, index: int):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ring index out of range")
+        value = float(self.tail()[index])
+        if self._ts is None:
+            return value
+        return (value, float(self._ts[(self._count - size + index) % self.capacity]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def clear(self) -> None:
+        self._count = 0
+
+
+class _RollingSums:
+    """Son `window` deger uzerinde sum(y), sum(y^2) ve OLS egimi icin sum(i*y).
+
+    push() pencereden cikan degeri (pencere doluysa) disaridan alir; degerlerin kendisi
+    ilgili _Ring'de tutulur.
+    """
+
+    __slots__ = ('n', 's', 'q', 't', 'window')
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self.n = 0
+        self.s = self.q = self.t = 0.0
+
+    def push(self, y: float, leaving: Optional[float]) -> None:
+        if self.n < self.window:
+            self.t += self.n * y
+            self.s += y
+            self.q += y * y
+            self.n += 1
+        else:
+            # Indeksler bir kayar: sum(i*y)' = sum(i*y) - (S - y_0) + (N-1)*y_new
+            self.t += (self.window - 1) * y - (self.s - leaving)
+            self.s += y - leaving
+            self.q += y * y - leaving * leaving
+
+    def is_finite(self) -> bool:
+        return math.isfinite(self.s) and math.isfinite(self.q) and math.isfinite(self.t)
+
+    def resync(self, values: np.ndarray) -> None:
+        self.n = len(values)
+        with np.errstate(invalid='ignore', over='ignore'):
+            self.s = float(values.sum())
+            self.q = float(values @ values)
+            self.t = float(np.arange(self.n) @ values)
+
+    def slope(self) -> float:
+        n = self.n
+        if n < 2:
+            return 0.0
+        sx = n * (n - 1) / 2.0
+        sxx = (n - 1) * n * (2 * n - 1) / 6.0
+        return (n * self.t - sx * self.s) / (n * sxx - sx * sx)
+
+    def mean(self) -> float:
+        return self.s / self.n if self.n else 0.0
+
+    def std(self) -> float:
+        if not self.n:
+            return 0.0
+        m = self.s / self.n
+        return math.sqrt(max(self.q / self.n - m * m, 0.0))
+
+
 class VolatilityRegimeDetector:
     """
     Advanced volatility regime detection system using multiple indicators
@@ -127,11 +244,22 @@ class VolatilityRegimeDetector:
         })
         self.range_efficiency_threshold = self.config.get('range_efficiency_threshold', 0.3)
 
-        # State tracking
-        self.price_history = deque(maxlen=self.lookback_long * 2)
-        self.volume_history = deque(maxlen=self.lookback_long * 2)
+        # State tracking: onceden ayrilmis ring buffer'lar + kayan toplamlar; tick basina
+        # maliyet gecmis uzunlugundan bagimsiz (sabit), detector basina ~40KB.
+        capacity = max(self.lookback_long * 2, self.lookback_medium + 1, self.vol_window + 1)
+        self.price_history = _Ring(capacity)
+        self.volume_history = _Ring(capacity)
         self.regime_history = deque(maxlen=100)
-        self.volatility_history = deque(maxlen=500)  # For percentile calculation
+        self.volatility_history = _Ring(500, with_timestamps=False)  # For percentile calculation
+        self._returns = _Ring(max(self.vol_window, self.lookback_short) + 1, with_timestamps=False)
+        self._price_short = _RollingSums(self.lookback_short)
+        self._price_medium = _RollingSums(self.lookback_medium)
+        self._volume_short = _RollingSums(self.lookback_short)
+        self._ret_vol = _RollingSums(max(self.vol_window - 1, 1))
+        self._ret_ac = _RollingSums(max(self.lookback_short - 1, 1))
+        self._ret_pairs = _RollingSums(max(self.lookback_short - 2, 1))
+        self._last_log_price: Optional[float] = None
+        self._ticks = 0
 
         self.logger.info(f"VolatilityRegimeDetector initialized: "
                         f"lookback=({self.lookback_short},{self.lookback_medium},{self.lookback_long}), "
@@ -149,14 +277,96 @@ class VolatilityRegimeDetector:
         if timestamp is None:
             timestamp = time.time()
 
-        self.price_history.append((price, timestamp))
-        self.volume_history.append((volume, timestamp))
+        price = float(price)
+        volume = float(volume)
+        self.price_history.append(price, timestamp)
+        self.volume_history.append(volume, timestamp)
+        self._push_window(self._price_short, self.price_history, price)
+        self._push_window(self._price_medium, self.price_history, price)
+        self._push_window(self._volume_short, self.volume_history, volume)
+
+        log_price = math.log(max(price, self._EPS))
+        if self._last_log_price is not None:
+            self._push_return(log_price - self._last_log_price)
+        self._last_log_price = log_price
+
+        self._ticks += 1
+        if self._ticks % _RESYNC_EVERY == 0:
+            self._resync()
 
         # Update volatility history for percentile calculation
         if len(self.price_history) >= self.vol_window:
-            recent_prices = [p[0] for p in list(self.price_history)[-self.vol_window:]]
-            volatility = self._calculate_volatility(np.array(recent_prices))
-            self.volatility_history.append(volatility)
+            self.volatility_history.append(self._current_volatility())
+
+    @staticmethod
+    def _push_window(sums: _RollingSums, ring: _Ring, value: float) -> None:
+        # Deger ring'e eklendikten sonra cagrilir; pencere doluysa cikan deger ring'de bir oncesidir
+        leaving = ring.back(sums.window) if sums.n >= sums.window else None
+        sums.push(value, leaving)
+        if not sums.is_finite():
+            # inf/NaN tick: toplamlar kalici bozulmasin; deger pencereden cikana kadar view'dan hesapla
+            sums.resync(ring.tail(sums.window))
+
+    def _push_return(self, r: float) -> None:
+        self._returns.append(r)
+        self._push_window(self._ret_vol, self._returns, r)
+        self._push_window(self._ret_ac, self._returns, r)
+        if len(self._returns) >= 2:
+            # Ardisik getiri carpimlari; cikan cift autocorr penceresinin onceki ilk iki getirisi
+            m = self._ret_ac.window
+            leaving = None
+            if self._ret_pairs.n >= self._ret_pairs.window:
+                leaving = self._returns.back(m) * self._returns.back(m - 1)
+            self._ret_pairs.push(self._returns.back(1) * r, leaving)
+            if not self._ret_pairs.is_finite():
+                self._ret_pairs.resync(self._pair_products())
+
+    def _pair_products(self) -> np.ndarray:
+        r = self._returns.tail(self._ret_ac.window)
+        return r[:-1] * r[1:]
+
+    def _resync(self) -> None:
+        """Kayan toplamlari ring view'larindan tam olarak yeniden hesapla (drift temizligi)."""
+        for sums, ring in ((self._price_short, self.price_history), (self._price_medium, self.price_history),
+                           (self._volume_short, self.volume_history), (self._ret_vol, self._returns),
+                           (self._ret_ac, self._returns)):
+            sums.resync(ring.tail(sums.window))
+        self._ret_pairs.resync(self._pair_products())
+
+    def _current_volatility(self) -> float:
+        """Son vol_window fiyatin log getiri std'si (yillik); kayan toplamlardan O(1)."""
+        if self._ret_vol.n < 1:
+            return 0.0
+        return self._ret_vol.std() * math.sqrt(252)
+
+    def _streaming_slope(self, sums: _RollingSums, ring: _Ring) -> float:
+        """_linear_regression_slope'un kayan toplamlarla karsiligi (ayni normalizasyon)."""
+        if sums.n < 2:
+            return 0.0
+        window = ring.tail(sums.n)
+        value_range = window.max() - window.min()
+        if value_range <= 0:
+            return 0.0
+        return float(np.clip(sums.slope() / value_range * sums.n, -1.0, 1.0))
+
+    def _streaming_autocorrelation(self) -> float:
+        """_calculate_autocorrelation'in kayan toplamlarla karsiligi (lag-1, son lookback_short fiyat)."""
+        if len(self.price_history) < self.lookback_short + 1 or self._ret_ac.n < 3:
+            return 0.0
+        window = self._returns.tail(self._ret_ac.n)
+        first, last = float(window[0]), float(window[-1])
+        k = self._ret_ac.n - 1
+        sx, sy = self._ret_ac.s - last, self._ret_ac.s - first
+        mx, my = sx / k, sy / k
+        var_x = max((self._ret_ac.q - last * last) / k - mx * mx, 0.0)
+        var_y = max((self._ret_ac.q - first * first) / k - my * my, 0.0)
+        std_x, std_y = math.sqrt(var_x), math.sqrt(var_y)
+        if std_x <= self._EPS or std_y <= self._EPS:
+            return 0.0
+        correlation = (self._ret_pairs.s / k - mx * my) / (std_x * std_y)
+        if math.isnan(correlation):
+            return 0.0
+        return float(np.clip(correlation, -1.0, 1.0))
 
     def detect_regime(self) -> Optional[RegimeDetection]:
         """
@@ -171,12 +381,8 @@ class VolatilityRegimeDetector:
             return None
 
         try:
-            # Extract price series
-            prices = np.array([p[0] for p in self.price_history])
-            volumes = np.array([v[0] for v in self.volume_history])
-
-            # Calculate regime metrics
-            metrics = self._calculate_regime_metrics(prices, volumes)
+            # Calculate regime metrics (ring view'lari + kayan toplamlar; kopya yok)
+            metrics = self._calculate_regime_metrics()
 
             # Classify regime
             regime = self._classify_regime(metrics)
@@ -209,24 +415,30 @@ class VolatilityRegimeDetector:
             self.logger.error(f"Error in regime detection: {e}")
             return None
 
-    def _calculate_regime_metrics(self, prices: np.ndarray, volumes: np.ndarray) -> RegimeMetrics:
-        """Calculate comprehensive regime analysis metrics"""
+    def _calculate_regime_metrics(self) -> RegimeMetrics:
+        """Calculate comprehensive regime analysis metrics
+
+        Egim, ortalama, volatilite ve autocorr kayan toplamlardan; max/min ve ADX sabit
+        boyutlu ring view'larindan hesaplanir. Dizi tabanli yardimcilar (_calculate_*)
+        ayni sonuclari veren referans uygulamalardir.
+        """
+        prices = self.price_history.tail()
 
         # Trend strength calculation
-        trend_strength = self._calculate_trend_strength(prices)
+        trend_strength = self._streaming_trend_strength(prices)
 
         # Volatility percentile
-        current_volatility = self._calculate_volatility(prices[-self.vol_window:])
+        current_volatility = self._current_volatility()
         volatility_percentile = self._calculate_volatility_percentile(current_volatility)
 
         # Range efficiency (how much price moves vs total range)
         range_efficiency = self._calculate_range_efficiency(prices)
 
         # Price autocorrelation (momentum persistence)
-        autocorrelation = self._calculate_autocorrelation(prices)
+        autocorrelation = self._streaming_autocorrelation()
 
         # Volume-price trend alignment
-        volume_trend = self._calculate_volume_trend_alignment(prices, volumes)
+        volume_trend = self._streaming_volume_alignment()
 
         # Regime stability (consistency over recent periods)
         regime_stability = self._calculate_regime_stability()
@@ -240,6 +452,27 @@ class VolatilityRegimeDetector:
             regime_stability=regime_stability
         )
 
+    def _streaming_trend_strength(self, prices: np.ndarray) -> float:
+        """_calculate_trend_strength'in kayan toplamlarla karsiligi."""
+        if len(prices) < self.lookback_medium:
+            return 0.0
+        short_trend = self._streaming_slope(self._price_short, self.price_history)
+        medium_trend = self._streaming_slope(self._price_medium, self.price_history)
+        adx_strength = self._calculate_adx_strength(prices)
+        ma_alignment = self._ma_alignment(prices[-1], self._price_short.mean(), self._price_medium.mean())
+        trend_strength = (abs(short_trend) + abs(medium_trend) + adx_strength + ma_alignment) / 4.0
+        return float(np.clip(trend_strength, 0.0, 1.0))
+
+    def _streaming_volume_alignment(self) -> float:
+        """_calculate_volume_trend_alignment'in kayan toplamlarla karsiligi."""
+        if len(self.price_history) < self.lookback_short or len(self.volume_history) < self.lookback_short:
+            return 0.0
+        price_trend = self._streaming_slope(self._price_short, self.price_history)
+        volume_trend = self._streaming_slope(self._volume_short, self.volume_history)
+        if abs(price_trend) < 1e-6 or abs(volume_trend) < 1e-6:
+            return 0.0
+        return float(np.sign(price_trend) * np.sign(volume_trend))
+
     def _calculate_trend_strength(self, prices: np.ndarray) -> float:
         """
         Calculate trend strength using multiple timeframe analysis
@@ -287,10 +520,12 @@ class VolatilityRegimeDetector:
         if len(self.volatility_history) < 10:
             return 50.0  # Default to median
 
-        historical_vols = list(self.volatility_history)
+        historical_vols = self.volatility_history.tail()
         if HAS_SCIPY:
-            from scipy import stats as scipy_stats
-            percentile = scipy_stats.percentileofscore(historical_vols, current_volatility)
+            # scipy.stats.percentileofscore(kind='rank') ile ayni formul; masked array yukunden kacinir
+            left = np.count_nonzero(historical_vols < current_volatility)
+            right = np.count_nonzero(historical_vols <= current_volatility)
+            percentile = (left + right + (1 if right > left else 0)) * 50.0 / len(historical_vols)
         else:
             # Fallback percentile calculation
             percentile = self._calculate_percentile_fallback(historical_vols, current_volatility)
@@ -298,13 +533,13 @@ class VolatilityRegimeDetector:
 
     def _calculate_percentile_fallback(self, values: List[float], target: float) -> float:
         """Fallback percentile calculation without scipy"""
-        if not values:
+        if len(values) == 0:
             return 50.0
 
-        # Sort values and compute counts relative to target
-        sorted_values = sorted(values)
-        count_below = sum(1 for v in sorted_values if v < target)
-        count_equal = sum(1 for v in sorted_values if v == target)
+        # Compute counts relative to target
+        values = np.asarray(values, dtype=float)
+        count_below = np.count_nonzero(values < target)
+        count_equal = np.count_nonzero(values == target)
 
         # Percentile calculation (similar to scipy percentileofscore)
         percentile = (count_below + 0.5 * count_equal) / len(values) * 100.0
@@ -534,8 +769,10 @@ class VolatilityRegimeDetector:
         # Calculate multiple timeframe MAs
         ma_short = np.mean(prices[-self.lookback_short:])
         ma_medium = np.mean(prices[-self.lookback_medium:])
-        current_price = prices[-1]
+        return self._ma_alignment(prices[-1], ma_short, ma_medium)
 
+    @staticmethod
+    def _ma_alignment(current_price: float, ma_short: float, ma_medium: float) -> float:
         # Check alignment: all MAs in same direction relative to price
         if current_price > ma_short > ma_medium:
             alignment = 1.0  # Strong uptrend alignment
@@ -554,7 +791,7 @@ class VolatilityRegimeDetector:
         if len(self.price_history) < 2:
             return 0.0
 
-        recent_prices = [p[0] for p in list(self.price_history)[-5:]]
+        recent_prices = self.price_history.tail(5)
         if len(recent_prices) < 2:
             return 0.0
 
@@ -1,12 +1,15 @@
 import contextlib
 import json
 import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
 from config.settings import Settings
 
+from src.api.ticker_snapshot import get_ticker_snapshot
 from src.data_fetcher import DataFetcher
 from src.indicators import IndicatorCalculator
 from src.utils.cost_calculator import get_cost_calculator
@@ -19,6 +22,21 @@ from src.utils.microstructure import get_microstructure_filter
 from src.utils.structured_log import slog
 from src.utils.threshold_cache import get_cached_threshold
 
+# Process havuzu worker'i: her process kendi hafif SignalGenerator'ini bir kez kurar
+# (DataFetcher/A32 bilesenleri olmadan; sadece indikator + skor asamasi kosar).
+_WORKER_STATE = {}
+
+
+def _process_compute(df):
+    gen = _WORKER_STATE.get('generator')
+    if gen is None:
+        gen = SignalGenerator.__new__(SignalGenerator)
+        gen.indicator_calc = IndicatorCalculator()
+        gen.logger = get_logger("SignalGenerator")
+        _WORKER_STATE['generator'] = gen
+    indicators = gen.indicator_calc.calculate_all_indicators(df)
+    return indicators, gen._calculate_scores(df, indicators)
+
 
 class SignalGenerator:
     def __init__(self):
@@ -28,6 +46,10 @@ class SignalGenerator:
         # Histerezis için önceki sinyaller (thread-safe)
         self._prev_signals = {}
         self._lock = threading.Lock()
+        # Paralel dongu havuzlari (SIGNAL_WORKERS > 1 iken tembel kurulur) ve son dongu sureleri
+        self._io_pool = None
+        self._cpu_pool = None
+        self.last_cycle_timings = {}
 
         # A32 Edge Hardening components (conditional initialization)
         self._edge_monitor = None
@@ -95,33 +117,164 @@ class SignalGenerator:
         return value
 
     def generate_signals(self, pairs=None):
-        """Tüm pariteler için sinyal üret"""
+        """Tüm pariteler için sinyal üret
+
+        SIGNAL_WORKERS > 1 ise paralel dongu kullanilir (bkz. _generate_signals_parallel);
+        cikti sirasi her iki modda da giris parite sirasidir.
+        """
         if pairs is None:
             pairs = self.data_fetcher.load_top_pairs()
         if not pairs:
             self.logger.warning("Sinyal üretmek için parite listesi boş")
             return {}
 
-        signals = {}
+        workers = int(getattr(Settings, 'SIGNAL_WORKERS', 1) or 1)
+        if workers > 1 and len(pairs) > 1:
+            return self._generate_signals_parallel(list(pairs), workers)
 
+        signals = {}
+        t0 = time.perf_counter()
         for pair in pairs:
             try:
                 signal = self.generate_pair_signal(pair)
                 if signal:
-                    # Timestamp'i koru, ek olarak iso formatli kopya ekle
-                    if 'timestamp' in signal and not signal.get('timestamp_iso'):
-                        ts_val = signal['timestamp']
-                        try:
-                            iso_val = ts_val.isoformat() if hasattr(ts_val, 'isoformat') else str(ts_val)
-                        except Exception:
-                            iso_val = str(ts_val)
-                        signal['timestamp_iso'] = iso_val
-                    signals[pair] = signal
+                    signals[pair] = self._with_timestamp_iso(signal)
             except Exception as e:
                 self.logger.error(f"{pair} sinyal üretilemedi: {e}")
+        self.last_cycle_timings = {'mode': 'serial', 'workers': 1, 'pairs': len(pairs),
+                                   'total': time.perf_counter() - t0}
+        return signals
 
+    def _with_timestamp_iso(self, signal):
+        # Timestamp'i koru, ek olarak iso formatli kopya ekle
+        if 'timestamp' in signal and not signal.get('timestamp_iso'):
+            ts_val = signal['timestamp']
+            try:
+                iso_val = ts_val.isoformat() if hasattr(ts_val, 'isoformat') else str(ts_val)
+            except Exception:
+                iso_val = str(ts_val)
+            signal['timestamp_iso'] = iso_val
+        return signal
+
+    def _generate_signals_parallel(self, pairs, workers):
+        """Asamali paralel dongu.
+
+        1) load: frame okuma + 24h hacim thread havuzunda (I/O)
+        2) compute: indikator + skor; 'thread' modunda ayni havuzda (artimli state kullanilir),
+           'process' modunda process havuzunda (tam batch hesap, artimli state yok)
+        3) finalize: HTF / histerezis / A32 / cikti seri ve giris sirasinda; histerezis
+           state'i _lock altinda ve deterministik kalir.
+        Asama sureleri last_cycle_timings'e yazilir ve 'signal_cycle' olarak loglanir.
+        """
+        t_start = time.perf_counter()
+        io_pool = self._get_io_pool(workers)
+
+        volume_futs = {pair: io_pool.submit(self.get_24h_volume, pair) for pair in pairs}
+        frames = {}
+        for pair, fut in zip(pairs, [io_pool.submit(self._load_and_validate_data, p) for p in pairs]):
+            try:
+                df = fut.result()
+            except Exception as e:
+                self.logger.error(f"{pair} sinyal üretilemedi: {e}")
+                continue
+            if df is not None:
+                frames[pair] = df
+        t_loaded = time.perf_counter()
+
+        computed = self._compute_stage(frames, workers)
+        t_computed = time.perf_counter()
+
+        signals = {}
+        for pair in pairs:
+            if pair not in computed:
+                continue
+            df, indicators_full, scores = computed[pair]
+            try:
+                volume = volume_futs[pair].result()
+            except Exception:
+                volume = 0.0
+            try:
+                signal = self._finalize_signal(pair, df, indicators_full, scores, volume_24h=volume)
+                if signal:
+                    signals[pair] = self._with_timestamp_iso(signal)
+            except Exception as e:
+                self.logger.error(f"{pair} sinyal üretilemedi: {e}")
+        t_end = time.perf_counter()
+
+        self.last_cycle_timings = {
+            'mode': f"parallel_{self._cpu_executor_kind()}",
+            'workers': workers,
+            'pairs': len(pairs),
+            'load': t_loaded - t_start,
+            'compute': t_computed - t_loaded,
+            'finalize': t_end - t_computed,
+            'total': t_end - t_start,
+        }
+        with contextlib.suppress(Exception):
+            slog('signal_cycle', **{k: (round(v, 4) if isinstance(v, float) else v)
+                                    for k, v in self.last_cycle_timings.items()})
         return signals
 
+    def _cpu_executor_kind(self):
+        kind = str(getattr(Settings, 'SIGNAL_CPU_EXECUTOR', 'thread') or 'thread').lower()
+        return 'process' if kind == 'process' else 'thread'
+
+    def _get_io_pool(self, workers):
+        pool = self._io_pool
+        if pool is None or pool._max_workers != workers:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            pool = self._io_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="signal-io")
+        return pool
+
+    def _get_cpu_pool(self, workers):
+        pool = self._cpu_pool
+        if pool is None or pool._max_workers != workers:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            pool = self._cpu_pool = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+    def _compute_stage(self, frames, workers):
+        """Indikator + skor asamasi: {pair: (df, indicators, scores)} (giris sirasi korunur)."""
+        if self._cpu_executor_kind() == 'process':
+            try:
+                pool = self._get_cpu_pool(workers)
+                futs = {pair: pool.submit(_process_compute, df) for pair, df in frames.items()}
+                out = {}
+                for pair, fut in futs.items():
+                    try:
+                        indicators_full, scores = fut.result()
+                        out[pair] = (frames[pair], indicators_full, scores)
+                    except Exception as e:
+                        self.logger.error(f"{pair} sinyal üretilemedi: {e}")
+                return out
+            except Exception as e:
+                # Havuz kurulamadi / kirildi: bu dongu thread moduna duser
+                self.logger.warning(f"Process havuzu kullanilamadi, thread moduna dusuluyor: {e}")
+                self._cpu_pool = None
+        pool = self._get_io_pool(workers)
+        futs = {pair: pool.submit(self._compute_pair, pair, df) for pair, df in frames.items()}
+        out = {}
+        for pair, fut in futs.items():
+            try:
+                out[pair] = (frames[pair], *fut.result())
+            except Exception as e:
+                self.logger.error(f"{pair} sinyal üretilemedi: {e}")
+        return out
+
+    def _compute_pair(self, symbol, df, live=True):
+        indicators_full = self._calculate_indicators(df, symbol if live else None)
+        return indicators_full, self._calculate_scores(df, indicators_full)
+
+    def close(self):
+        """Paralel dongu havuzlarini kapat."""
+        for attr in ('_io_pool', '_cpu_pool'):
+            pool = getattr(self, attr, None)
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                setattr(self, attr, None)
+
     def generate_pair_signal(self, symbol, df_override=None):
         """Generate signal for a single pair using pipeline pattern.
 
@@ -140,14 +293,15 @@ class SignalGenerator:
         if df is None:
             return None
 
-        # Step 2: Compute indicators
-        # IMPORTANT: use alias that tests monkeypatch (_calculate_indicators)
+        # Step 2-3: Compute indicators and scores
+        # IMPORTANT: _compute_pair uses the alias that tests monkeypatch (_calculate_indicators)
         # so unit tests can inject indicator outputs (e.g., final_score)
-        indicators_full = self._calculate_indicators(df)
-
-        # Step 3: Calculate scores
-        scores = self._calculate_scores(df, indicators_full)
+        # Live frames (no override) use the per-symbol incremental indicator state
+        indicators_full, scores = self._compute_pair(symbol, df, live=df_override is None)
+        return self._finalize_signal(symbol, df, indicators_full, scores)
 
+    def _finalize_signal(self, symbol, df, indicators_full, scores, volume_24h=None):
+        """Steps 3.5-5: HTF filter, hysteresis, A32 and output (per-symbol state, serial)"""
         # Step 3.4: HTF filter pre-check removed - now handled in Step 3.5 _apply_htf_filter
 
         # Step 3.5: Optional HTF EMA(200) trend filter (disabled by default)
@@ -184,7 +338,8 @@ class SignalGenerator:
                 self.logger.info(f"A32 blocked {symbol} signal: {a32_result['reason']}")
 
         # Step 5: Build signal data
-        return self._build_signal_data(symbol, df, indicators_full, scores, final_signal, raw_signal)
+        return self._build_signal_data(symbol, df, indicators_full, scores, final_signal, raw_signal,
+                                       volume_24h=volume_24h)
 
     def _load_and_validate_data(self, symbol, df_override=None):
         """Load and validate market data for signal generation"""
@@ -236,13 +391,16 @@ class SignalGenerator:
             # Fallback to default
             return '15m'
 
-    def _compute_indicators(self, df):
-        """Compute all technical indicators"""
+    def _compute_indicators(self, df, symbol=None):
+        """Compute all technical indicators (incremental per symbol/timeframe when symbol given)"""
+        incremental = getattr(self.indicator_calc, 'calculate_all_indicators_incremental', None)
+        if symbol and incremental is not None:
+            return incremental(df, (symbol, self._get_active_timeframe()))
         return self.indicator_calc.calculate_all_indicators(df)
 
     # Backward-compat alias for tests that monkeypatch _calculate_indicators
-    def _calculate_indicators(self, df):  # pragma: no cover - simple alias
-        return self._compute_indicators(df)
+    def _calculate_indicators(self, df, symbol=None):  # pragma: no cover - simple alias
+        return self._compute_indicators(df, symbol)
 
     def _calculate_scores(self, df, indicators_full):
         """Calculate indicator scores with confluence and regime filtering"""
@@ -483,7 +641,7 @@ class SignalGenerator:
             elif prev_signal in ('AL', 'SAT') and final_signal == 'BEKLE':
                 self._prev_signals[symbol] = 'BEKLE'
 
-    def _build_signal_data(self, symbol, df, indicators_full, scores, final_signal, raw_signal):
+    def _build_signal_data(self, symbol, df, indicators_full, scores, final_signal, raw_signal, volume_24h=None):
         """Build final signal data structure"""
         indicators_serialized = self._serialize_indicators(indicators_full)
 
@@ -511,7 +669,7 @@ class SignalGenerator:
             'timestamp_iso': self._get_timestamp_iso(df['timestamp'].iloc[-1]),
             'close_price': df['close'].iloc[-1],
             'percent_change': self._calculate_percent_change(df),
-            'volume_24h': self.get_24h_volume(symbol),
+            'volume_24h': self.get_24h_volume(symbol) if volume_24h is None else volume_24h,
             'indicators': indicators_serialized,
             'scores': scores['scores'],
             'total_score': scores['total_score'],
@@ -609,6 +767,10 @@ class SignalGenerator:
                 # Deterministic sentetik hacim (symbol hash'ina gore) -> 50k - 5M arasi
                 base = (abs(hash(symbol)) % 4_950_000) + 50_000
                 return float(base)
+            # Tum semboller tek toplu cagri ile (TTL cache); sembol snapshot'ta yoksa tekil cagri
+            volume = get_ticker_snapshot(self.data_fetcher.api).volume_24h(symbol)
+            if volume is not None:
+                return float(volume)
             ticker = self.data_fetcher.api.client.get_ticker(symbol=symbol)
             if isinstance(ticker, dict):
                 return float(ticker.get('quoteVolume') or ticker.get('volume') or 0.0)
@@ -12,12 +12,17 @@ Uzmanlar:
 - S4: xsect_mom (Cross-sectional momentum)
 """
 
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict
 
+import numpy as np
 import pandas as pd
 
+BB_WINDOW = 20
+BANDWIDTH_LOOKBACK = 180
+
 
 @dataclass
 class SpecialistSignal:
@@ -151,6 +156,45 @@ class SpecialistInterface(ABC):
         return f"<SpecialistInterface: {self.specialist_id}>"
 
 
+_rolling_std_local = threading.local()
+
+
+def rolling_close_std(data: pd.DataFrame, window: int) -> np.ndarray:
+    """Close rolling std (ddof=1) dizisi; ayni frame icin uzmanlar arasinda paylasilir.
+
+    Thread basina tek frame'lik cache: ayni ensemble cagrisinda gating ve uzmanlar ayni
+    DataFrame nesnesini kullanir, rolling hesap pencere basina bir kez yapilir. Frame
+    kimligi + uzunluk + son close degismisse cache yenilenir.
+    """
+    close = data['close'].to_numpy(dtype=float)
+    last = close[-1] if len(close) else None
+    cache = getattr(_rolling_std_local, 'entry', None)
+    if cache is None or cache['frame'] is not data or cache['len'] != len(close) or cache['last'] != last:
+        cache = {'frame': data, 'len': len(close), 'last': last, 'by_window': {}}
+        _rolling_std_local.entry = cache
+    std = cache['by_window'].get(window)
+    if std is None:
+        std = data['close'].rolling(window).std().to_numpy(dtype=float)
+        cache['by_window'][window] = std
+    return std
+
+
+def bandwidth_history(data: pd.DataFrame, window: int = BB_WINDOW,
+                      lookback: int = BANDWIDTH_LOOKBACK) -> np.ndarray:
+    """Son `lookback` bar icin BB bandwidth gecmisi (vektorel).
+
+    i. eleman, bar i'den ONCEKI `window` barlik pencereden hesaplanir:
+    (upper - lower) / close[i-1] = 4 * std / close[i-1]; (sma iki bantta sadelesir).
+    """
+    n = len(data)
+    start = max(max(1, n - min(lookback, n)) - 1, window - 1)
+    if start >= n - 1:
+        return np.empty(0)
+    close = data['close'].to_numpy(dtype=float)
+    std = rolling_close_std(data, window)
+    return 4.0 * std[start:n - 1] / close[start:n - 1]
+
+
 def calculate_gating_scores(data: pd.DataFrame, indicators: Dict[str, Any]) -> GatingScores:
     """
     Market rejim skorlari hesaplama utility fonksiyonu
@@ -172,21 +216,11 @@ def calculate_gating_scores(data: pd.DataFrame, indicators: Dict[str, Any]) -> G
         bb_lower = indicators.get('bb_lower', data['close'].iloc[-1] * 0.98)
         bb_bandwidth = (bb_upper - bb_lower) / data['close'].iloc[-1]
 
-        # Son 180 bar BB bandwidth hesapla (approximation)
-        lookback = min(180, len(data))
-        historical_bw = []
-        for i in range(max(1, len(data) - lookback), len(data)):
-            if i >= 20:  # BB icin minimum veri
-                period_data = data.iloc[i-20:i]
-                sma = period_data['close'].mean()
-                std = period_data['close'].std()
-                h_upper = sma + 2 * std
-                h_lower = sma - 2 * std
-                h_bw = (h_upper - h_lower) / period_data['close'].iloc[-1]
-                historical_bw.append(h_bw)
-
-        if historical_bw:
-            current_percentile = sum(1 for bw in historical_bw if bb_bandwidth >= bw) / len(historical_bw)
+        # Son 180 bar BB bandwidth gecmisi (rolling std ile, bar basina slice yok)
+        historical_bw = bandwidth_history(data)
+
+        if len(historical_bw):
+            current_percentile = np.count_nonzero(bb_bandwidth >= historical_bw) / len(historical_bw)
             squeeze_score = 1.0 - current_percentile  # Dusuk BW = yuksek squeeze
         else:
             squeeze_score = 0.5  # Default
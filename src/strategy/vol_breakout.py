@@ -13,9 +13,15 @@ Gating Rules:
 import logging
 from typing import Any, Dict
 
+import numpy as np
 import pandas as pd
 
-from .specialist_interface import GatingScores, SpecialistInterface, SpecialistSignal
+from .specialist_interface import (
+    GatingScores,
+    SpecialistInterface,
+    SpecialistSignal,
+    rolling_close_std,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -123,7 +129,8 @@ class VolBreakoutSpecialist(SpecialistInterface):
         donchian_lower = self._calculate_donchian_lower(data)
 
         # ATR median over 20 periods for volatility filter
-        atr_median = data['close'].rolling(20).std().median() * 0.02  # Approximation
+        close_std = rolling_close_std(data, 20)
+        atr_median = (np.nanmedian(close_std) if np.isfinite(close_std).any() else np.nan) * 0.02  # Approximation
         atr_threshold = atr_median * ATR_MIN_MULT
 
         # Volume confirmation
@@ -187,8 +194,8 @@ class VolBreakoutSpecialist(SpecialistInterface):
         volume_strength = min(1.0, (volume_ratio - 1.0) / 1.0)  # Normalize to 0-1
 
         # ATR strength approximation
-        recent_atr = data['close'].rolling(5).std().iloc[-1] * 0.02
-        long_atr = data['close'].rolling(20).std().iloc[-1] * 0.02
+        recent_atr = rolling_close_std(data, 5)[-1] * 0.02
+        long_atr = rolling_close_std(data, 20)[-1] * 0.02
         atr_strength = min(1.0, recent_atr / long_atr) if long_atr > 0 else 0.5
 
         # Weighted confidence
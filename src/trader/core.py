@@ -30,6 +30,7 @@ except Exception:  # pragma: no cover
 from config.settings import RuntimeConfig, Settings
 
 from src.api.binance_api import BinanceAPI
+from src.api.ticker_snapshot import get_ticker_snapshot
 from src.risk_manager import RiskManager
 from src.utils.advanced_metrics import (  # Performance monitoring
     get_trading_metrics,
@@ -373,6 +374,9 @@ class Trader:
         # Graceful snapshot (CR-0045)
         with contextlib.suppress(Exception):
             self._write_shutdown_snapshot()
+        # Kuyruktaki guard event'leri diske yaz
+        with contextlib.suppress(Exception):
+            self.trade_store.guard_events.flush()
         maybe_flush_metrics(self, force=True)
         return True
 
@@ -423,14 +427,18 @@ class Trader:
             if not Settings.SPREAD_GUARD_ENABLED:
                 return True
 
-            # Get current ticker for bid/ask prices
-            ticker = self.api.get_ticker(symbol)
-            if not ticker or 'bidPrice' not in ticker or 'askPrice' not in ticker:
-                # No ticker data available - allow trade (fail open)
-                return True
-
-            bid_price = float(ticker['bidPrice'])
-            ask_price = float(ticker['askPrice'])
+            # Bid/ask: taze toplu ticker snapshot'i, yoksa tekil ticker cagrisi
+            quote = get_ticker_snapshot(self.api).bid_ask(
+                symbol, max_age=getattr(Settings, 'SPREAD_SNAPSHOT_MAX_AGE_SEC', 10.0))
+            if quote is not None:
+                bid_price, ask_price = quote
+            else:
+                ticker = self.api.get_ticker(symbol)
+                if not ticker or 'bidPrice' not in ticker or 'askPrice' not in ticker:
+                    # No ticker data available - allow trade (fail open)
+                    return True
+                bid_price = float(ticker['bidPrice'])
+                ask_price = float(ticker['askPrice'])
 
             if bid_price <= 0 or ask_price <= 0:
                 # Invalid prices - allow trade (fail open)
@@ -9,6 +9,7 @@ Bu modül gelişmiş sistem metriklerini toplar:
 - Trading strategy metrics
 """
 
+import functools
 import gc
 import json
 import logging
@@ -17,14 +18,16 @@ import time
 from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 
 import psutil
+from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
 # Constants
 MAX_PERFORMANCE_PROFILES = 100
+LATENCY_HIST_BUCKETS = 48  # log2(ns) kovalari: 2^47 ns ~ 39 saat
 
 
 @dataclass
@@ -45,18 +48,70 @@ class PerformanceProfile:
     call_count: int
 
 
+class LatencyHistogram:
+    """Sabit boyutlu log2(ns) kovali gecikme histogrami.
+
+    Thread basina tutulur (kilit yok); kova i, bit_length(ns) == i olan sureleri sayar,
+    yani ust siniri 2^i ns'dir. Yuzdelikler bu ust sinirdan tahmin edilir (en fazla 2x).
+    """
+
+    __slots__ = ('buckets', 'count', 'max_ns', 'total_ns')
+
+    def __init__(self):
+        self.buckets = [0] * LATENCY_HIST_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.buckets[min(elapsed_ns.bit_length(), LATENCY_HIST_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for i, c in enumerate(other.buckets):
+            self.buckets[i] += c
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile_ms(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.buckets):
+            seen += c
+            if c and seen >= rank:
+                return min(float(1 << i), float(self.max_ns)) / 1e6
+        return self.max_ns / 1e6
+
+
 class AdvancedMetricsCollector:
     """Advanced system ve application metrics collector"""
 
     def __init__(self, history_size: int = 1000):
         self.history_size = history_size
         self.metrics_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
-        self.performance_profiles: List[PerformanceProfile] = []
+        self.performance_profiles: Deque[PerformanceProfile] = deque(maxlen=MAX_PERFORMANCE_PROFILES)
         self.memory_baselines: Dict[str, float] = {}
         self.running = False
         self.collection_thread: Optional[threading.Thread] = None
         self.lock = threading.Lock()
 
+        # Hot-path profil: her cagri perf_counter_ns ile thread-local histograma yazilir;
+        # pahali RSS/CPU probu yalnizca her N cagrida bir (fonksiyon + thread basina) alinir.
+        self.profile_sample_every = max(1, int(getattr(Settings, 'PROFILE_PROBE_SAMPLE_EVERY', 100)))
+        self._hist_local = threading.local()
+        self._thread_histograms: List[Dict[str, LatencyHistogram]] = []
+        self._process: Optional[psutil.Process] = None
+        self.profile_exporter = None
+        self.profile_export_interval = float(getattr(Settings, 'PROFILE_EXPORT_INTERVAL_SEC', 15.0))
+        self._last_profile_export = 0.0
+        self._exported_totals: Dict[str, tuple] = {}
+
         # Alert thresholds
         self.thresholds = {
             'cpu_critical': 90.0,
@@ -100,6 +155,9 @@ class AdvancedMetricsCollector:
                 # Performance counters
                 self._collect_performance_counters()
 
+                # Hot-path latency histogramlari -> Prometheus (periyodik)
+                self._maybe_export_profiles()
+
                 time.sleep(interval)
 
             except Exception as e:
@@ -175,44 +233,124 @@ class AdvancedMetricsCollector:
             point = MetricPoint(timestamp, value, tags)
             self.metrics_history[name].append(point)
 
+    def _histograms_for_thread(self) -> Dict[str, LatencyHistogram]:
+        hists = getattr(self._hist_local, 'hists', None)
+        if hists is None:
+            hists = self._hist_local.hists = {}
+            with self.lock:
+                self._thread_histograms.append(hists)
+        return hists
+
+    def _probe(self):
+        """Pahali RSS/CPU probu (orneklenmis cagrilarda)."""
+        if self._process is None:
+            self._process = psutil.Process()
+        return self._process.memory_info().rss / (1024**2), psutil.cpu_percent()
+
     def profile_function(self, func_name: str):
-        """Decorator for function performance profiling"""
+        """Decorator for function performance profiling
+
+        Her cagri: perf_counter_ns + thread-local histogram (kilit ve syscall yok).
+        Her `profile_sample_every` cagrida bir: RSS/CPU probu ve performance_profiles kaydi
+        (ilk cagri her zaman orneklenir; profile_sample_every=1 eski davranis).
+        """
         def decorator(func):
+            @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                # Memory baseline
-                memory_before = psutil.Process().memory_info().rss / (1024**2)
-                cpu_before = psutil.cpu_percent()
-                start_time = time.perf_counter()
+                hists = self._histograms_for_thread()
+                hist = hists.get(func_name)
+                if hist is None:
+                    hist = hists[func_name] = LatencyHistogram()
+                sampled = hist.count % self.profile_sample_every == 0
+                if sampled:
+                    memory_before, cpu_before = self._probe()
+                start_ns = time.perf_counter_ns()
 
                 try:
                     return func(*args, **kwargs)
                 finally:
-                    # Performance measurement
-                    end_time = time.perf_counter()
-                    execution_time = (end_time - start_time) * 1000  # ms
-
-                    memory_after = psutil.Process().memory_info().rss / (1024**2)
-                    memory_delta = memory_after - memory_before
-                    cpu_after = psutil.cpu_percent()
-
-                    # Store profile
-                    profile = PerformanceProfile(
-                        function_name=func_name,
-                        execution_time_ms=execution_time,
-                        memory_delta_mb=memory_delta,
-                        cpu_percent=(cpu_before + cpu_after) / 2,
-                        call_count=1
-                    )
-
-                    with self.lock:
-                        self.performance_profiles.append(profile)
-                        # Keep only last 100 profiles
-                        if len(self.performance_profiles) > MAX_PERFORMANCE_PROFILES:
-                            self.performance_profiles = self.performance_profiles[-MAX_PERFORMANCE_PROFILES:]
+                    elapsed_ns = time.perf_counter_ns() - start_ns
+                    hist.record(elapsed_ns)
+
+                    if sampled:
+                        memory_after, cpu_after = self._probe()
+                        profile = PerformanceProfile(
+                            function_name=func_name,
+                            execution_time_ms=elapsed_ns / 1e6,
+                            memory_delta_mb=memory_after - memory_before,
+                            cpu_percent=(cpu_before + cpu_after) / 2,
+                            call_count=1
+                        )
+                        # deque(maxlen) son MAX_PERFORMANCE_PROFILES kaydi tutar
+                        with self.lock:
+                            self.performance_profiles.append(profile)
 
             return wrapper
         return decorator
 
+    def latency_snapshot(self) -> Dict[str, LatencyHistogram]:
+        """Tum thread histogramlarinin fonksiyon bazli birlesimi (kilitsiz okuma, yaklasik anlik)."""
+        with self.lock:
+            per_thread = list(self._thread_histograms)
+        merged: Dict[str, LatencyHistogram] = {}
+        for hists in per_thread:
+            for name, hist in list(hists.items()):
+                merged.setdefault(name, LatencyHistogram()).merge(hist)
+        return merged
+
+    def get_latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Fonksiyon bazli cagri sayisi ve gecikme ozetleri (ms)."""
+        summary = {}
+        for name, hist in self.latency_snapshot().items():
+            summary[name] = {
+                'calls': hist.count,
+                'avg_ms': hist.total_ns / hist.count / 1e6 if hist.count else 0.0,
+                'p50_ms': hist.percentile_ms(0.50),
+                'p99_ms': hist.percentile_ms(0.99),
+                'max_ms': hist.max_ns / 1e6,
+            }
+        return summary
+
+    def attach_profile_exporter(self, exporter, interval_sec: Optional[float] = None) -> None:
+        """Latency histogramlarini periyodik olarak bu PrometheusExporter'a aktar."""
+        self.profile_exporter = exporter
+        if interval_sec is not None:
+            self.profile_export_interval = float(interval_sec)
+
+    def export_profiles(self, exporter=None) -> int:
+        """Son aktarimdan bu yana cagri/sure artislarini ve yuzdelikleri exporter'a yaz."""
+        exporter = exporter or self.profile_exporter
+        if exporter is None or not hasattr(exporter, 'record_function_profile'):
+            return 0
+        exported = 0
+        for name, hist in self.latency_snapshot().items():
+            prev_count, prev_ns = self._exported_totals.get(name, (0, 0))
+            exporter.record_function_profile(
+                name,
+                calls=hist.count - prev_count,
+                total_ms=(hist.total_ns - prev_ns) / 1e6,
+                latency_ms={
+                    'p50': hist.percentile_ms(0.50),
+                    'p99': hist.percentile_ms(0.99),
+                    'max': hist.max_ns / 1e6,
+                },
+            )
+            self._exported_totals[name] = (hist.count, hist.total_ns)
+            exported += 1
+        return exported
+
+    def _maybe_export_profiles(self) -> None:
+        if self.profile_exporter is None:
+            return
+        now = time.monotonic()
+        if now - self._last_profile_export < self.profile_export_interval:
+            return
+        self._last_profile_export = now
+        try:
+            self.export_profiles()
+        except Exception as e:
+            logger.debug(f"Profile export failed: {e}")
+
     def get_metric_summary(self, metric_name: str, window_minutes: int = 5) -> Dict:
         """Get statistical summary for a metric"""
         with self.lock:
@@ -0,0 +1,100 @@
+"""
+Bounded in-memory LRU cache for pair DataFrames.
+
+Anahtar (symbol, interval); her girdi bir 'version' ile saklanir (DataFetcher icin
+kaynak dosyanin mtime'i). get() sirasinda version uyusmazsa girdi bayat sayilir ve
+miss doner. Donen frame'ler paylasimlidir: cagiran taraf yerinde degisiklik
+yapmamali (gerekirse .copy()).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger("FrameCache")
+
+# Olay isimleri (Prometheus label degerleri)
+EVENT_HIT = "hit"
+EVENT_MISS = "miss"
+EVENT_EVICTION = "eviction"
+
+
+class FrameCache:
+    """Thread-safe LRU; hit/miss/eviction sayaclari tutar."""
+
+    def __init__(self, max_entries: int = 64, on_event: Optional[Callable[[str], None]] = None):
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._on_event = on_event
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _emit(self, event: str) -> None:
+        if self._on_event is None:
+            return
+        try:
+            self._on_event(event)
+        except Exception as e:  # metrik hatasi okuma yolunu bozmasin
+            logger.debug(f"frame cache event hook hatasi: {e}")
+
+    def get(self, key: Hashable, version: Any) -> Optional[Any]:
+        """Guncel version ile saklanan degeri dondur; yoksa/bayatsa None (miss)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hit = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                hit = None
+        self._emit(EVENT_HIT if hit is not None else EVENT_MISS)
+        return hit
+
+    def put(self, key: Hashable, version: Any, value: Any) -> None:
+        if not self.enabled or value is None:
+            return
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+        for _ in range(evicted):
+            self._emit(EVENT_EVICTION)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -5,14 +5,20 @@ Records structured data when guards are triggered.
 """
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import queue
 import sqlite3
+import threading
 import time
+import weakref
 from contextlib import suppress
 from datetime import datetime, timezone
 from typing import Any, Dict, List, NamedTuple, Optional
 
+from config.settings import Settings
+
 from src.utils.logger import get_logger
 
 # Ensure shared cache is disabled (Windows file lock hygiene)
@@ -95,15 +101,61 @@ CREATE INDEX IF NOT EXISTS idx_guard_events_guard ON guard_events(guard);
 CREATE INDEX IF NOT EXISTS idx_guard_events_symbol ON guard_events(symbol);
 """
 
+_INSERT_SQL = """
+    INSERT INTO guard_events
+    (ts, guard, symbol, reason, extra, session_id, severity, blocked)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Writer kuyrugu kontrol isaretleri
+_STOP = object()
+# Bu kadar sure bos kalan writer baglantisini kapatip thread'i bitirir (ilk kayitta yeniden baslar)
+_IDLE_CLOSE_SEC = 10.0
+_DROP_LOG_EVERY = 100
+
+# Acik writer'lar cikista flush edilir
+_LIVE_RECORDERS: "weakref.WeakSet[GuardEventRecorder]" = weakref.WeakSet()
+
+
+class _FlushRequest:
+    """Writer'in bekleyen satirlari commit edip haber vermesi icin kuyruk isareti."""
+
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
 class GuardEventRecorder:
     """Centralized guard event recording system.
 
     Thread-safe, minimal performance impact, structured data storage.
+
+    Async modda (GUARD_EVENTS_ASYNC, varsayilan) `record_guard_event` satiri sinirli bir
+    kuyruga koyup hemen doner; arka plan writer tek bir uzun omurlu WAL baglantisi ile
+    satirlari boyut/zaman tetiginde `executemany` ile toplu commit eder. Kuyruk doluysa
+    olay dusurulur ve sayilir (trade yolu bloklanmaz). Okuma metodlari once `flush()`
+    cagirir; kapanista `close()` (veya atexit) bekleyen satirlari yazar.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, async_writes: Optional[bool] = None):
         self.db_path = db_path
+        self.async_writes = bool(getattr(Settings, 'GUARD_EVENTS_ASYNC', True)
+                                 if async_writes is None else async_writes)
+        self.batch_size = max(1, int(getattr(Settings, 'GUARD_EVENTS_BATCH_SIZE', 64)))
+        self.flush_interval = max(0.0, float(getattr(Settings, 'GUARD_EVENTS_FLUSH_INTERVAL_MS', 250.0)) / 1000.0)
+        self.enqueue_timeout = max(0.0, float(getattr(Settings, 'GUARD_EVENTS_ENQUEUE_TIMEOUT_MS', 0.0)) / 1000.0)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(getattr(Settings, 'GUARD_EVENTS_QUEUE_MAX', 10000))))
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0, 'written': 0, 'dropped': 0, 'batches': 0,
+            'write_errors': 0, 'max_queue_depth': 0,
+        }
         self._init_schema()
+        if self.async_writes:
+            _LIVE_RECORDERS.add(self)
 
     def _close_safely(self, conn: sqlite3.Connection) -> None:
         """Platform-dostu kapatma: Windows'ta handle serbest birakma icin kisa gecikme."""
@@ -122,11 +174,12 @@ class GuardEventRecorder:
                 # time.sleep(0) NOP
                 time.sleep(0)
 
-    def _connect(self) -> sqlite3.Connection:
+    def _connect(self, journal_mode: Optional[str] = "DELETE") -> sqlite3.Connection:
         """Create a SQLite connection with Windows-friendly settings.
 
-        - Force journal_mode=DELETE to avoid WAL side files that keep locks on Windows.
-        - Keep synchronous at NORMAL for reasonable durability without extra I/O.
+        - Short-lived connections force journal_mode=DELETE to avoid WAL side files that keep locks on Windows.
+        - The long-lived writer connection asks for WAL (readers never block the writer).
+        - journal_mode=None leaves the mode untouched (read-only helpers).
         """
         conn = sqlite3.connect(self.db_path, timeout=1.0)
         # Test ortaminda (Windows) dosya kilitlerini azaltmak icin MEMORY journaling
@@ -137,9 +190,12 @@ class GuardEventRecorder:
                 conn.execute("PRAGMA synchronous=OFF;")
             with suppress(Exception):
                 conn.execute("PRAGMA temp_store=MEMORY;")
-        else:
+        elif journal_mode:
             with suppress(Exception):
-                conn.execute("PRAGMA journal_mode=DELETE;")
+                conn.execute(f"PRAGMA journal_mode={journal_mode};")
+            if journal_mode == "WAL":
+                with suppress(Exception):
+                    conn.execute("PRAGMA synchronous=NORMAL;")
         return conn
 
     def _init_schema(self) -> None:
@@ -153,24 +209,34 @@ class GuardEventRecorder:
                 self._close_safely(conn)
                 self._post_close_pause()
 
+    @staticmethod
+    def _event_row(event: GuardEvent) -> tuple:
+        # Zaman damgasi yazim aninda degil olay aninda alinir
+        ts = datetime.now(timezone.utc).isoformat()
+        extra_json = json.dumps(event.extra_data) if event.extra_data else None
+        return (ts, event.guard, event.symbol, event.reason, extra_json,
+                event.session_id, event.severity, event.blocked)
+
     def record_guard_event(self, event: GuardEvent) -> None:
         """Record a guard event with structured data.
 
+        Async modda satir kuyruga alinir ve hemen donulur; sync modda dogrudan yazilir.
+
         Args:
             event: GuardEvent instance with all event data
         """
         try:
-            ts = datetime.now(timezone.utc).isoformat()
-            extra_json = json.dumps(event.extra_data) if event.extra_data else None
-
+            row = self._event_row(event)
+        except Exception as e:
+            LOGGER.warning(f"Failed to record guard event: {e}")
+            return
+        if self.async_writes:
+            self._enqueue(row)
+            return
+        try:
             conn = self._connect()
             try:
-                conn.execute("""
-                    INSERT INTO guard_events
-                    (ts, guard, symbol, reason, extra, session_id, severity, blocked)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (ts, event.guard, event.symbol, event.reason, extra_json,
-                     event.session_id, event.severity, event.blocked))
+                conn.execute(_INSERT_SQL, row)
                 conn.commit()
             finally:
                 self._close_safely(conn)
@@ -178,6 +244,141 @@ class GuardEventRecorder:
         except Exception as e:
             LOGGER.warning(f"Failed to record guard event: {e}")
 
+    # ---------- Async writer ----------
+    def _enqueue(self, row: tuple) -> None:
+        try:
+            if self.enqueue_timeout > 0:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['dropped'] += 1
+                dropped = self._stats['dropped']
+            if dropped == 1 or dropped % _DROP_LOG_EVERY == 0:
+                LOGGER.warning(f"Guard event queue full, dropped={dropped}")
+            return
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats['enqueued'] += 1
+            if depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = depth
+        self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="GuardEventWriter", daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        pending: List[tuple] = []
+        deadline = 0.0
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if pending else _IDLE_CLOSE_SEC
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    if pending:
+                        conn = self._write_batch(conn, pending)
+                        pending = []
+                        continue
+                    # Bosta: baglantiyi birak ve thread'i bitir (yeni kayit yeni writer baslatir)
+                    with self._writer_lock:
+                        if self._queue.empty():
+                            self._writer = None
+                            return
+                    continue
+                if item is _STOP:
+                    conn = self._write_batch(conn, pending)
+                    pending = []
+                    with self._writer_lock:
+                        # STOP'tan sonra gelen kayit varsa onlari da yaz
+                        if self._queue.empty():
+                            self._writer = None
+                            return
+                    continue
+                if isinstance(item, _FlushRequest):
+                    conn = self._write_batch(conn, pending)
+                    pending = []
+                    item.done.set()
+                    continue
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                if len(pending) >= self.batch_size:
+                    conn = self._write_batch(conn, pending)
+                    pending = []
+        finally:
+            if conn is not None:
+                self._release_writer_conn(conn)
+
+    def _write_batch(self, conn: Optional[sqlite3.Connection], rows: List[tuple]) -> Optional[sqlite3.Connection]:
+        """Satirlari tek transaction'da yaz; hata durumunda batch dusurulur ve baglanti yenilenir."""
+        if not rows:
+            return conn
+        try:
+            if conn is None:
+                conn = self._connect(journal_mode="WAL")
+            conn.executemany(_INSERT_SQL, rows)
+            conn.commit()
+        except Exception as e:
+            with self._stats_lock:
+                self._stats['write_errors'] += 1
+                self._stats['dropped'] += len(rows)
+            LOGGER.warning(f"Failed to record guard events batch ({len(rows)} rows): {e}")
+            if conn is not None:
+                self._close_safely(conn)
+            return None
+        with self._stats_lock:
+            self._stats['written'] += len(rows)
+            self._stats['batches'] += 1
+        return conn
+
+    def _release_writer_conn(self, conn: sqlite3.Connection) -> None:
+        # WAL yan dosyalarini birakmak icin DELETE journal'a don (TradeStore.close ile ayni)
+        with suppress(Exception):
+            conn.execute("PRAGMA journal_mode=DELETE;")
+        self._close_safely(conn)
+        self._post_close_pause()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktaki tum olaylarin commit edilmesini bekle. Zaman asiminda False."""
+        with self._writer_lock:
+            writer = self._writer
+        if writer is None and self._queue.empty():
+            return True
+        req = _FlushRequest()
+        # Kuyruk doluysa isaretin sigmasi icin once writer calisiyor olmali
+        self._ensure_writer()
+        try:
+            self._queue.put(req, timeout=timeout)
+        except queue.Full:
+            return False
+        return req.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Bekleyen olaylari yaz, writer baglantisini kapat (sonraki kayit writer'i yeniden baslatir)."""
+        with self._writer_lock:
+            writer = self._writer
+        if writer is None:
+            if not self._queue.empty():
+                self.flush(timeout)
+            return
+        with suppress(queue.Full):
+            self._queue.put(_STOP, timeout=timeout)
+        writer.join(timeout)
+
+    def writer_stats(self) -> Dict[str, Any]:
+        """Writer sayaclari: enqueued/written/dropped/batches/write_errors/queue_depth."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['async'] = self.async_writes
+        return stats
+
     def record_guard_event_simple(
         self, guard: str, reason: str, symbol: Optional[str] = None
     ) -> None:
@@ -209,8 +410,9 @@ class GuardEventRecorder:
         Returns:
             List of guard event records
         """
+        self.flush()
         try:
-            conn = self._connect()
+            conn = self._connect(journal_mode=None)
             try:
                 conn.row_factory = sqlite3.Row
 
@@ -266,8 +468,9 @@ class GuardEventRecorder:
         Returns:
             Statistics dict with counts, rates, top symbols etc
         """
+        self.flush()
         try:
-            conn = self._connect()
+            conn = self._connect(journal_mode=None)
             try:
                 conn.row_factory = sqlite3.Row
 
@@ -335,8 +538,9 @@ class GuardEventRecorder:
         Returns:
             Number of deleted records
         """
+        self.flush()
         try:
-            conn = self._connect()
+            conn = self._connect(journal_mode=None)
             try:
                 cursor = conn.execute(
                     """
@@ -355,3 +559,10 @@ class GuardEventRecorder:
         except Exception as e:
             LOGGER.warning(f"Failed to cleanup guard events: {e}")
             return 0
+
+
+@atexit.register
+def _flush_live_recorders() -> None:
+    for recorder in list(_LIVE_RECORDERS):
+        with suppress(Exception):
+            recorder.close(timeout=2.0)
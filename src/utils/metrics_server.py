@@ -130,6 +130,11 @@ class MetricsServer:
         self.server_thread: Optional[threading.Thread] = None
         self.exporter = _safe_get_exporter_instance()
         self.logger = get_logger(__name__)
+        # profile_performance latency histogramlari bu exporter uzerinden yayinlanir
+        if self.exporter is not None:
+            with contextlib.suppress(Exception):
+                from src.utils.advanced_metrics import get_metrics_collector
+                get_metrics_collector().attach_profile_exporter(self.exporter)
 
     def start(self):
         """Start the metrics server"""
@@ -0,0 +1,288 @@
+"""
+Columnar on-disk OHLCV store (memory-mapped NumPy).
+
+Her symbol/interval icin bir klasor tutulur:
+
+    {raw_dir}/{SYMBOL}_{interval}.ohlcv/
+        meta.json          -> {"version", "rows", "columns": [[isim, dtype], ...]}
+        timestamp.bin      -> datetime64[ns] ham dizi
+        open.bin ...       -> float64 / int64 ham diziler
+
+Kolon dosyalari yalnizca sona ekleme ile buyur; meta.json icindeki 'rows' commit
+noktasidir (once kolonlar yazilir, sonra meta atomik olarak degistirilir). Yarim
+kalan bir eklemeden sonra kolonlarda 'rows' otesindeki baytlar okunmaz ve bir sonraki
+yazimda kirpilir. Tam yeniden yazimda (write) kolonlar .tmp dosyalarina yazilip
+os.replace ile yerine konur; veri yazimi sirasinda cokme eski store'u bozmaz. Okumalar np.memmap ile yapilir; CSV metin/tarih parse maliyeti yoktur.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger("OhlcvStore")
+
+STORE_SUFFIX = ".ohlcv"
+STORE_VERSION = 1
+META_FILE = "meta.json"
+_TS_COL = "timestamp"
+
+
+def is_pair_data_file(name: str) -> bool:
+    """raw/ altindaki bir girdinin parite verisi (CSV veya store) olup olmadigi."""
+    return name.endswith(".csv") or name.endswith(STORE_SUFFIX)
+
+
+def _column_dtype(series: pd.Series) -> Optional[np.dtype]:
+    """Saklanabilir kolon tipi; desteklenmeyenler (metin vb.) icin None."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return np.dtype("datetime64[ns]")
+    if pd.api.types.is_bool_dtype(series):
+        return None
+    if pd.api.types.is_integer_dtype(series):
+        return np.dtype("int64")
+    if pd.api.types.is_float_dtype(series):
+        return np.dtype("float64")
+    return None
+
+
+def _normalize_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+    """Kolonlari tipli hale getir; sayisal olmayan kolonlari birak.
+
+    Binance kline'larindaki string sayilar numerige cevrilir, 'ignore' gibi
+    anlamsiz alanlar numerik degilse atlanir.
+    """
+    out = {}
+    schema: List[Tuple[str, str]] = []
+    for col in df.columns:
+        s = df[col]
+        if col == _TS_COL:
+            s = pd.to_datetime(s, errors="coerce")
+            if getattr(s.dt, "tz", None) is not None:
+                s = s.dt.tz_convert(None)
+        elif s.dtype == object:
+            conv = pd.to_numeric(s, errors="coerce")
+            if conv.isna().sum() > s.isna().sum():
+                continue  # gercekten metin
+            s = conv
+        dt = _column_dtype(s)
+        if dt is None:
+            continue
+        out[str(col)] = s.to_numpy(dtype=dt)
+        schema.append((str(col), dt.str))
+    return pd.DataFrame(out, copy=False), schema
+
+
+class OhlcvStore:
+    """Append-only, kolon bazli ikili OHLCV deposu (thread-safe)."""
+
+    def __init__(self, raw_dir: str):
+        self.raw_dir = raw_dir
+        self._lock = threading.RLock()
+
+    # ---------------- Paths & metadata -----------------
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.raw_dir, f"{symbol}_{interval}{STORE_SUFFIX}")
+
+    def exists(self, symbol: str, interval: str) -> bool:
+        return os.path.exists(os.path.join(self.path(symbol, interval), META_FILE))
+
+    def mtime(self, symbol: str, interval: str) -> Optional[float]:
+        """Son commit zamani (meta.json mtime); store yoksa None."""
+        try:
+            return os.path.getmtime(os.path.join(self.path(symbol, interval), META_FILE))
+        except OSError:
+            return None
+
+    def _read_meta(self, base: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(base, META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if int(meta.get("version", 0)) != STORE_VERSION:
+                logger.warning(f"Desteklenmeyen store surumu: {base}")
+                return None
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, base: str, rows: int, schema: List[Tuple[str, str]]) -> None:
+        tmp = os.path.join(base, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": STORE_VERSION, "rows": int(rows), "columns": [list(c) for c in schema]}, f)
+        os.replace(tmp, os.path.join(base, META_FILE))
+
+    def row_count(self, symbol: str, interval: str) -> int:
+        meta = self._read_meta(self.path(symbol, interval))
+        return int(meta["rows"]) if meta else 0
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Saklanan son bar zamani (tum dosyayi okumadan)."""
+        with self._lock:
+            base = self.path(symbol, interval)
+            meta = self._read_meta(base)
+            if not meta or not meta["rows"]:
+                return None
+            rows = int(meta["rows"])
+            ts = self._memmap(base, _TS_COL, "<M8[ns]", rows)
+            return pd.Timestamp(ts[rows - 1])
+
+    # ---------------- Read -----------------
+    @staticmethod
+    def _memmap(base: str, col: str, dtype: str, rows: int) -> np.ndarray:
+        if rows <= 0:
+            return np.empty(0, dtype=np.dtype(dtype))
+        return np.memmap(os.path.join(base, f"{col}.bin"), dtype=np.dtype(dtype), mode="r", shape=(rows,))
+
+    def read(self, symbol: str, interval: str, tail: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """Store'u DataFrame olarak dondur; tail verilirse yalnizca son N satir kopyalanir."""
+        with self._lock:
+            base = self.path(symbol, interval)
+            meta = self._read_meta(base)
+            if meta is None:
+                return None
+            rows = int(meta["rows"])
+            start = max(0, rows - int(tail)) if tail else 0
+            cols: Dict[str, np.ndarray] = {}
+            try:
+                for name, dtype in meta["columns"]:
+                    mm = self._memmap(base, name, dtype, rows)
+                    cols[name] = np.array(mm[start:])  # memmap'i hemen serbest birak (Windows dosya kilidi)
+                    del mm
+            except (OSError, ValueError) as e:
+                logger.error(f"Store okunamadi {base}: {e}")
+                return None
+        return pd.DataFrame(cols, copy=False)
+
+    # ---------------- Write -----------------
+    def write(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Store'u verilen frame ile tamamen degistir. Yazilan satir sayisini dondurur."""
+        frame, schema = _normalize_frame(df)
+        if _TS_COL in frame.columns:
+            frame = frame.sort_values(_TS_COL, kind="stable").reset_index(drop=True)
+        with self._lock:
+            base = self.path(symbol, interval)
+            os.makedirs(base, exist_ok=True)
+            # Kolonlar once gecici dosyalara yazilir; eski veri yerinde bozulmaz. Yarida
+            # kalan yazim yalnizca .tmp birakir ve mevcut meta/kolonlar okunabilir kalir.
+            tmp_paths = []
+            try:
+                for name, dtype in schema:
+                    tmp = os.path.join(base, f"{name}.bin.tmp")
+                    with open(tmp, "wb") as f:
+                        f.write(frame[name].to_numpy(dtype=np.dtype(dtype)).tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    tmp_paths.append((tmp, os.path.join(base, f"{name}.bin")))
+            except BaseException:
+                for tmp, _ in tmp_paths:
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp)
+                raise
+            for tmp, final in tmp_paths:
+                os.replace(tmp, final)
+            self._write_meta(base, len(frame), schema)
+        return len(frame)
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Yeni barlari sona ekle.
+
+        Gelen frame'in ilk zamanina esit veya sonraki saklanan barlar (ornegin henuz
+        kapanmamis son mum) yenisiyle degistirilir; daha eski barlar dokunulmadan kalir.
+        Sema farkliysa veya timestamp yoksa tam yeniden yazim yapilir.
+        Eklenen (veya degistirilen) satir sayisini dondurur.
+        """
+        frame, schema = _normalize_frame(df)
+        if frame.empty:
+            return 0
+        with self._lock:
+            base = self.path(symbol, interval)
+            meta = self._read_meta(base)
+            if meta is None or _TS_COL not in frame.columns or [tuple(c) for c in meta["columns"]] != schema:
+                if meta is not None and meta["rows"] and _TS_COL in frame.columns:
+                    old = self.read(symbol, interval)
+                    if old is not None and _TS_COL in old.columns:
+                        first_new = frame[_TS_COL].min()
+                        frame = pd.concat([old[old[_TS_COL] < first_new], frame], ignore_index=True)
+                return self.write(symbol, interval, frame)
+            frame = frame.sort_values(_TS_COL, kind="stable").drop_duplicates(_TS_COL, keep="last")
+            rows = int(meta["rows"])
+            keep = rows
+            if rows:
+                ts = self._memmap(base, _TS_COL, "<M8[ns]", rows)
+                first_new = frame[_TS_COL].iloc[0].to_datetime64()
+                keep = int(np.searchsorted(ts, first_new, side="left"))
+                del ts
+            for name, dtype in schema:
+                dt = np.dtype(dtype)
+                col_path = os.path.join(base, f"{name}.bin")
+                with open(col_path, "r+b" if os.path.exists(col_path) else "wb") as f:
+                    f.truncate(keep * dt.itemsize)  # yarim kalmis yazimlari / degisen kuyrugu kirp
+                    f.seek(keep * dt.itemsize)
+                    f.write(frame[name].to_numpy(dtype=dt).tobytes())
+            self._write_meta(base, keep + len(frame), schema)
+        return len(frame)
+
+    def trim(self, symbol: str, interval: str, keep: int, slack: int = 0) -> int:
+        """Yalnizca son `keep` bari tut; satir sayisi keep+slack'i asmadikca dokunma.
+
+        slack, her eklemede tam yeniden yazim yapmamak icin birakilan pay.
+        Atilan satir sayisini dondurur.
+        """
+        keep = int(keep)
+        if keep <= 0:
+            return 0
+        with self._lock:
+            rows = self.row_count(symbol, interval)
+            if rows <= keep + max(0, int(slack)):
+                return 0
+            tail = self.read(symbol, interval, tail=keep)
+            if tail is None:
+                return 0
+            self.write(symbol, interval, tail)
+        return rows - keep
+
+    # ---------------- Migration -----------------
+    def migrate_csv(self, csv_path: str, symbol: str, interval: str) -> int:
+        """Tek bir CSV'yi store'a aktar (CSV dosyasi silinmez)."""
+        df = pd.read_csv(csv_path, parse_dates=[_TS_COL])
+        return self.write(symbol, interval, df)
+
+    def migrate_all(self, interval: Optional[str] = None, force: bool = False) -> Dict[str, int]:
+        """raw/ altindaki CSV'leri tek seferde store'a tasir.
+
+        force=False iken store'u CSV'den yeni olan pariteler atlanir.
+        Donus: {"SYMBOL_interval": satir_sayisi}
+        """
+        migrated: Dict[str, int] = {}
+        try:
+            names = os.listdir(self.raw_dir)
+        except OSError:
+            return migrated
+        for fn in sorted(names):
+            if not fn.endswith(".csv"):
+                continue
+            stem = fn[:-4]
+            if "_" not in stem:
+                continue
+            symbol, iv = stem.rsplit("_", 1)
+            if interval and iv != interval:
+                continue
+            csv_path = os.path.join(self.raw_dir, fn)
+            store_m = self.mtime(symbol, iv)
+            if not force and store_m is not None and store_m >= os.path.getmtime(csv_path):
+                continue
+            try:
+                migrated[stem] = self.migrate_csv(csv_path, symbol, iv)
+            except Exception as e:
+                logger.warning(f"CSV migrate edilemedi {fn}: {e}")
+        if migrated:
+            logger.info(f"{len(migrated)} CSV store'a tasindi")
+        return migrated
@@ -251,6 +251,34 @@ class PrometheusExporter:
             registry=self.registry,
         )
 
+        # DataFetcher frame cache (hit/miss/eviction)
+        self.frame_cache_events_counter = Counter(
+            'bot_frame_cache_events_total',
+            'Pair frame LRU cache events by type (hit/miss/eviction)',
+            ['event'],
+            registry=self.registry,
+        )
+
+        # Profiled hot-path functions (advanced_metrics latency histograms)
+        self.function_calls_counter = Counter(
+            'bot_function_calls_total',
+            'Profiled function call count',
+            ['function'],
+            registry=self.registry,
+        )
+        self.function_latency_seconds_counter = Counter(
+            'bot_function_latency_seconds_total',
+            'Profiled function cumulative execution time (seconds)',
+            ['function'],
+            registry=self.registry,
+        )
+        self.function_latency_gauge = Gauge(
+            'bot_function_latency_ms',
+            'Profiled function latency since start by quantile (p50/p99/max, log2 bucket upper bound)',
+            ['function', 'quantile'],
+            registry=self.registry,
+        )
+
         # Bot info
         self.bot_info = Info(
             'bot_info',
@@ -304,6 +332,28 @@ class PrometheusExporter:
         with contextlib.suppress(Exception):
             self.order_submit_retries_counter.labels(reason=str(reason)).inc()
 
+    def record_frame_cache_event(self, event: str) -> None:
+        """Increment frame cache event counter (hit/miss/eviction)."""
+        if not getattr(self, 'enabled', False):
+            return
+        with contextlib.suppress(Exception):
+            self.frame_cache_events_counter.labels(event=str(event)).inc()
+
+    def record_function_profile(self, function: str, calls: int, total_ms: float,
+                                latency_ms: dict) -> None:
+        """Push aggregated hot-path latency for one profiled function (safe if disabled).
+
+        latency_ms: {'p50': .., 'p99': .., 'max': ..} in milliseconds.
+        """
+        if not getattr(self, 'enabled', False):
+            return
+        with contextlib.suppress(Exception):
+            if calls > 0:
+                self.function_calls_counter.labels(function=function).inc(calls)
+                self.function_latency_seconds_counter.labels(function=function).inc(max(total_ms, 0.0) / 1000.0)
+            for quantile, value in latency_ms.items():
+                self.function_latency_gauge.labels(function=function, quantile=quantile).set(value)
+
     def _update_bot_info(self):
         """Update bot information metrics"""
         try:
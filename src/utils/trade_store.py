@@ -115,6 +115,11 @@ class TradeStore:
             self.close()
 
     def close(self):  # simple closing API expected by tests
+        # Guard event writer'inda bekleyen satirlari yaz ve baglantisini birak
+        guard_events = getattr(self, 'guard_events', None)
+        if guard_events is not None:
+            with suppress(Exception):
+                guard_events.close()
         try:
             if hasattr(self, '_conn') and self._conn:
                 try:
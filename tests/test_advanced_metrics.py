@@ -16,6 +16,7 @@ from src.utils.advanced_metrics import (
     profile_performance,
     get_trading_metrics,
     TradingMetricsCollector,
+    LatencyHistogram,
     MetricPoint,
     PerformanceProfile
 )
@@ -315,5 +316,67 @@ class TestPerformanceIntegration:
         assert '"timestamp"' in export_data
 
 
+
+class TestSampledProfiling:
+    """Low-overhead profil modu: her cagri histograma, RSS/CPU probu ornekli"""
+
+    def test_probe_is_sampled_but_every_call_is_timed(self):
+        collector = AdvancedMetricsCollector()
+        collector.profile_sample_every = 10
+
+        @collector.profile_function("hot")
+        def hot(x):
+            return x + 1
+
+        with patch.object(collector, '_probe', wraps=collector._probe) as probe:
+            assert [hot(i) for i in range(25)] == list(range(1, 26))
+        # Orneklenen cagrilar 0, 10, 20 -> onceki + sonraki prob
+        assert probe.call_count == 6
+        assert len(collector.performance_profiles) == 3
+        assert collector.get_latency_summary()['hot']['calls'] == 25
+        assert hot.__name__ == 'hot'
+
+    def test_per_thread_histograms_merge(self):
+        collector = AdvancedMetricsCollector()
+        collector.profile_sample_every = 1000
+
+        @collector.profile_function("worker")
+        def work():
+            return None
+
+        threads = [threading.Thread(target=lambda: [work() for _ in range(200)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(collector._thread_histograms) == 4
+        assert collector.latency_snapshot()['worker'].count == 800
+
+    def test_histogram_percentiles_use_bucket_upper_bound(self):
+        hist = LatencyHistogram()
+        for ns in [1_000] * 98 + [1_000_000, 5_000_000]:
+            hist.record(ns)
+        assert hist.percentile_ms(0.5) == pytest.approx(1024 / 1e6)
+        assert hist.percentile_ms(0.99) == pytest.approx((1 << 20) / 1e6)
+        assert hist.percentile_ms(1.0) == pytest.approx(5.0)
+
+    def test_export_pushes_deltas_to_exporter(self):
+        collector = AdvancedMetricsCollector()
+        exporter = MagicMock()
+
+        @collector.profile_function("tick")
+        def tick():
+            return None
+
+        for _ in range(5):
+            tick()
+        collector.attach_profile_exporter(exporter, interval_sec=0)
+        collector._maybe_export_profiles()
+        for _ in range(3):
+            tick()
+        assert collector.export_profiles() == 1
+        calls = [c.kwargs['calls'] for c in exporter.record_function_profile.call_args_list]
+        assert calls == [5, 3]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,194 @@
+import math
+
+import numpy as np
+import pandas as pd
+from config.settings import Settings
+
+from src.backtest import calibrate
+from src.indicators import IndicatorCalculator
+
+
+def _make_df(seed: int, n: int = 260) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='h'),
+        'open': close + rng.normal(0, 0.1, n),
+        'high': close + np.abs(rng.normal(0, 1, n)),
+        'low': close - np.abs(rng.normal(0, 1, n)),
+        'close': close,
+        'volume': rng.uniform(1, 10, n),
+    })
+
+
+# Vektorizasyon oncesi per-bar prefix dongusunun birebir kopyasi (referans sonuc)
+def _baseline_simulate_trades(df: pd.DataFrame, indicators_full: dict, calc: IndicatorCalculator,  # noqa: PLR0912, PLR0913, PLR0915
+                     buy_thr: float, sell_thr: float, buy_exit: float, sell_exit: float,
+                     use_next_bar_fill: bool = False,
+                     commission_pct_per_side: float | None = None,
+                     slippage_pct_per_side: float | None = None,
+                     warmup_bars: int = 120,
+                     adx_min: float | None = None):
+    close_len = len(df)
+    # Esikler NaN ise direkt bos sonuc don
+    if any(isinstance(x, float) and math.isnan(x) for x in (buy_thr, sell_thr, buy_exit, sell_exit)):
+        return {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
+    if close_len <= warmup_bars + 5:
+        return {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
+    position = None
+    entry_price = None
+    trades = []
+    consec_losses = 0
+    max_consec_losses = 0
+    for i in range(warmup_bars, close_len):
+        sub_inds = {}
+        for name, val in indicators_full.items():
+            if isinstance(val, pd.Series):
+                sub_inds[name] = val.iloc[: i + 1]
+            elif isinstance(val, dict):
+                inner = {}
+                for k, v in val.items():
+                    if isinstance(v, pd.Series):
+                        inner[k] = v.iloc[: i + 1]
+                    else:
+                        inner[k] = v
+                sub_inds[name] = inner
+            else:
+                sub_inds[name] = val
+        sub_df = df.iloc[: i + 1]
+        scored = calc.score_indicators(sub_df, sub_inds)
+        score_val = scored['total_score']
+        adx_val = None
+        if adx_min is not None:
+            try:
+                adx_val = scored.get('scores', {}).get('ADX')
+                if adx_val is not None:
+                    adx_val = float(adx_val)
+            except Exception:
+                adx_val = None
+        price = float(sub_df['close'].iloc[-1])
+        if position == 'LONG':
+            if score_val < buy_exit or score_val <= sell_thr:
+                exit_price = price
+                if use_next_bar_fill and i + 1 < close_len:
+                    exit_price = float(df.iloc[i + 1]['open'])
+                pnl = (exit_price - entry_price) / entry_price * 100.0
+                trades.append(pnl)
+                if pnl < 0:
+                    consec_losses += 1
+                    max_consec_losses = max(max_consec_losses, consec_losses)
+                else:
+                    consec_losses = 0
+                position = None
+        elif position == 'SHORT':  # noqa: SIM102
+            if score_val > sell_exit or score_val >= buy_thr:
+                exit_price = price
+                if use_next_bar_fill and i + 1 < close_len:
+                    exit_price = float(df.iloc[i + 1]['open'])
+                pnl = (entry_price - exit_price) / entry_price * 100.0
+                trades.append(pnl)
+                if pnl < 0:
+                    consec_losses += 1
+                    max_consec_losses = max(max_consec_losses, consec_losses)
+                else:
+                    consec_losses = 0
+                position = None
+        if position is None:
+            # Dusuk ADX ortaminda yeni pozisyon acma
+            if adx_min is not None and adx_val is not None and adx_val < adx_min:
+                continue
+            if score_val >= buy_thr:
+                fill = price
+                if use_next_bar_fill and i + 1 < close_len:
+                    fill = float(df.iloc[i + 1]['open'])
+                position = 'LONG'
+                entry_price = fill
+            elif score_val <= sell_thr:
+                fill = price
+                if use_next_bar_fill and i + 1 < close_len:
+                    fill = float(df.iloc[i + 1]['open'])
+                position = 'SHORT'
+                entry_price = fill
+    if position and entry_price is not None:
+        last_price = float(df['close'].iloc[-1])
+        pnl = (last_price - entry_price) / entry_price * 100.0 if position == 'LONG' else (entry_price - last_price) / entry_price * 100.0
+        trades.append(pnl)
+        if pnl < 0:
+            consec_losses += 1
+            max_consec_losses = max(max_consec_losses, consec_losses)
+    total = len(trades)
+    if not total:
+        return {'total_trades': 0,'wins': 0,'losses': 0,'winrate': 0.0,'avg_gain_pct': 0.0,'avg_loss_pct': 0.0,'expectancy_pct': 0.0,'max_consec_losses': 0}
+    wins = [t for t in trades if t > 0]
+    losses = [t for t in trades if t <= 0]
+    winrate = len(wins)/total
+    avg_gain = float(np.mean(wins)) if wins else 0.0
+    avg_loss = float(abs(np.mean(losses))) if losses else 0.0
+    expectancy = winrate * avg_gain - (1 - winrate) * avg_loss
+    commission = commission_pct_per_side if commission_pct_per_side is not None else getattr(Settings, 'COMMISSION_PCT_PER_SIDE',0.0)
+    slippage = slippage_pct_per_side if slippage_pct_per_side is not None else getattr(Settings, 'SLIPPAGE_PCT_PER_SIDE',0.0)
+    cost_per_round = 2.0 * (commission + slippage)
+    adjusted_trades = [t - cost_per_round for t in trades]
+    wins_adj = [t for t in adjusted_trades if t > 0]
+    losses_adj = [t for t in adjusted_trades if t <= 0]
+    winrate_adj = len(wins_adj)/total if total else 0.0
+    avg_gain_adj = float(np.mean(wins_adj)) if wins_adj else 0.0
+    avg_loss_adj = float(abs(np.mean(losses_adj))) if losses_adj else 0.0
+    expectancy_adj = winrate_adj * avg_gain_adj - (1 - winrate_adj) * avg_loss_adj
+    return {'total_trades': total,'wins': len(wins),'losses': len(losses),'winrate': round(winrate*100,2),'avg_gain_pct': round(avg_gain,2),'avg_loss_pct': round(avg_loss,2),'expectancy_pct': round(expectancy,2),'max_consec_losses': int(max_consec_losses),'cost_per_round_pct': round(cost_per_round,4),'winrate_after_costs': round(winrate_adj*100,2),'expectancy_after_costs_pct': round(expectancy_adj,2)}
+
+
+def test_simulate_candidates_matches_single_candidate_runs():
+    calc = IndicatorCalculator()
+    df = _make_df(3)
+    inds = calc.calculate_all_indicators(df)
+    row = calibrate._score_matrix_row(df, inds, calc)
+    candidates = [(55.0, 40.0, 50.0, 45.0), (60.0, 35.0, 55.0, 40.0), (52.0, 45.0, 47.0, 50.0)]
+    for next_bar in (False, True):
+        batch = calibrate._simulate_candidates(row, candidates, use_next_bar_fill=next_bar, warmup_bars=40)
+        for cand, res in zip(candidates, batch):
+            single = calibrate._simulate_trades(df, inds, calc, *cand, use_next_bar_fill=next_bar, warmup_bars=40)
+            assert res == single
+
+
+def test_simulate_candidates_matches_baseline_loop():
+    calc = IndicatorCalculator()
+    candidates = [(55.0, 40.0, 50.0, 45.0), (60.0, 35.0, 55.0, 40.0), (52.0, 45.0, 47.0, 50.0),
+                  (58.0, 42.0, 53.0, 47.0)]
+    for seed in (3, 7):
+        df = _make_df(seed)
+        inds = calc.calculate_all_indicators(df)
+        row = calibrate._score_matrix_row(df, inds, calc)
+        for next_bar in (False, True):
+            for adx_min in (None, 20.0, 30.0):
+                batch = calibrate._simulate_candidates(row, candidates, use_next_bar_fill=next_bar,
+                                                       warmup_bars=40, adx_min=adx_min)
+                for cand, res in zip(candidates, batch):
+                    ref = _baseline_simulate_trades(df, inds, calc, *cand, use_next_bar_fill=next_bar,
+                                                    warmup_bars=40, adx_min=adx_min)
+                    assert res == ref, (seed, next_bar, adx_min, cand)
+
+
+def test_simulate_candidates_nan_threshold_is_empty():
+    calc = IndicatorCalculator()
+    df = _make_df(5)
+    row = calibrate._score_matrix_row(df, calc.calculate_all_indicators(df), calc)
+    res = calibrate._simulate_candidates(row, [(float('nan'), 40.0, 50.0, 45.0)], warmup_bars=40)
+    assert res[0]['total_trades'] == 0
+
+
+def test_optimize_thresholds_uses_single_score_pass():
+    calc = IndicatorCalculator()
+    frames = {f'S{i}': _make_df(i, 420) for i in range(3)}
+    loads = []
+
+    class _Fetcher:
+        def get_pair_data(self, sym, _tf, auto_fetch=False):  # noqa: ARG002
+            loads.append(sym)
+            return frames[sym].copy()
+
+    pct = {5: 30, 10: 33, 15: 36, 25: 40, 50: 48, 75: 55, 85: 58, 90: 61, 95: 65}
+    out = calibrate._optimize_thresholds(_Fetcher(), calc, list(frames), 58, 36, 53, 41, pct, 120)
+    assert out[0].get('baseline') is True
+    # Her sembol esik kombinasyon sayisindan bagimsiz olarak bir kez okunur
+    assert sorted(loads) == sorted(frames)
@@ -39,4 +39,4 @@ def test_cr0041_auto_refresh_basic(tmp_path):
     evts = get_slog_events()
     assert any(e['event']=='stale_refresh' for e in evts)
     for sym in summary['attempted']:
-        assert os.path.exists(f"{f.data_path}/raw/{sym}_1h.csv")
+        assert f.has_pair_data(sym, '1h')
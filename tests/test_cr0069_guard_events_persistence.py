@@ -42,6 +42,8 @@ class TestGuardEventRecorder:
 
             # Record simple event
             recorder.record_guard_event_simple("halt_flag", "Daily halt flag exists", "BTCUSDT")
+            # Async writer: satirin commit edilmesini bekle
+            recorder.flush()
 
             # Verify record exists
             with sqlite3.connect(db_path) as conn:
@@ -81,6 +83,7 @@ class TestGuardEventRecorder:
         )
 
         recorder.record_guard_event(event)
+        recorder.flush()
 
         # Verify record with extra data
         with sqlite3.connect(db_path) as conn:
@@ -218,6 +221,82 @@ class TestGuardEventRecorder:
         assert 'error' in stats
 
 
+class TestGuardEventAsyncWriter:
+    """Batched background writer: size/time triggers, drop accounting, flush/close."""
+
+    @staticmethod
+    def _recorder(tmp_path, monkeypatch, **settings):
+        import src.utils.guard_events as ge
+        for key, value in settings.items():
+            monkeypatch.setattr(ge.Settings, key, value, raising=False)
+        return GuardEventRecorder(str(tmp_path / "guard.db"), async_writes=True)
+
+    @staticmethod
+    def _count(db_path) -> int:
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM guard_events").fetchone()[0]
+
+    def test_size_trigger_batches_rows(self, tmp_path, monkeypatch):
+        recorder = self._recorder(tmp_path, monkeypatch, GUARD_EVENTS_BATCH_SIZE=10,
+                                  GUARD_EVENTS_FLUSH_INTERVAL_MS=60_000)
+        for i in range(25):
+            recorder.record_guard_event_simple("correlation_block", f"corr {i}", f"S{i}USDT")
+        assert recorder.flush()
+        stats = recorder.writer_stats()
+        assert stats['written'] == 25
+        # 10 + 10 boyut tetigi, kalan 5 flush ile
+        assert stats['batches'] == 3
+        assert stats['dropped'] == 0
+        assert self._count(recorder.db_path) == 25
+        recorder.close()
+
+    def test_time_trigger_commits_without_flush(self, tmp_path, monkeypatch):
+        import time
+        recorder = self._recorder(tmp_path, monkeypatch, GUARD_EVENTS_BATCH_SIZE=1000,
+                                  GUARD_EVENTS_FLUSH_INTERVAL_MS=20)
+        for i in range(3):
+            recorder.record_guard_event_simple("spread", f"spread {i}", "BTCUSDT")
+        deadline = time.monotonic() + 5.0
+        while recorder.writer_stats()['written'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self._count(recorder.db_path) == 3
+        recorder.close()
+
+    def test_full_queue_drops_and_counts(self, tmp_path, monkeypatch):
+        recorder = self._recorder(tmp_path, monkeypatch, GUARD_EVENTS_QUEUE_MAX=2,
+                                  GUARD_EVENTS_ENQUEUE_TIMEOUT_MS=0)
+        # Writer'i baslatmadan kuyrugu doldur
+        recorder._writer = object()
+        for i in range(5):
+            recorder.record_guard_event_simple("spread", f"spread {i}", "BTCUSDT")
+        stats = recorder.writer_stats()
+        assert stats['enqueued'] == 2
+        assert stats['dropped'] == 3
+        assert stats['queue_depth'] == 2
+        recorder._writer = None
+        assert recorder.flush()
+        assert self._count(recorder.db_path) == 2
+
+    def test_close_flushes_pending_and_writer_restarts(self, tmp_path, monkeypatch):
+        recorder = self._recorder(tmp_path, monkeypatch, GUARD_EVENTS_BATCH_SIZE=1000,
+                                  GUARD_EVENTS_FLUSH_INTERVAL_MS=60_000)
+        for i in range(7):
+            recorder.record_guard_event_simple("halt_flag", f"halt {i}")
+        recorder.close()
+        assert recorder._writer is None
+        assert self._count(recorder.db_path) == 7
+        # Kapanistan sonra kayit writer'i yeniden baslatir
+        recorder.record_guard_event_simple("halt_flag", "after close")
+        assert len(recorder.get_guard_events()) == 8
+        recorder.close()
+
+    def test_sync_mode_writes_inline(self, tmp_path):
+        recorder = GuardEventRecorder(str(tmp_path / "guard.db"), async_writes=False)
+        recorder.record_guard_event_simple("halt_flag", "inline", "BTCUSDT")
+        assert recorder._writer is None
+        assert self._count(recorder.db_path) == 1
+
+
 class TestGuardEventIntegration:
     """Integration tests with TradeStore."""
 
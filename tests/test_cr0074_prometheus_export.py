@@ -80,6 +80,18 @@ class TestPrometheusExport:
         assert 'guard="daily_loss"' in output
         assert 'guard="correlation"' in output
 
+    def test_function_profile_metrics(self):
+        """Test hot-path function profile export"""
+        from src.utils.prometheus_export import PrometheusExporter
+
+        exporter = PrometheusExporter()
+        exporter.record_function_profile('Trader.process_price_update', calls=120, total_ms=60.0,
+                                         latency_ms={'p50': 0.25, 'p99': 2.0, 'max': 3.5})
+
+        output = exporter.generate_latest()
+        assert 'bot_function_calls_total{function="Trader.process_price_update"} 120.0' in output
+        assert 'bot_function_latency_ms{function="Trader.process_price_update",quantile="p99"} 2.0' in output
+
     def test_position_and_pnl_gauges(self):
         """Test position count and PnL gauges"""
         from src.utils.prometheus_export import PrometheusExporter
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategy.specialist_interface import calculate_gating_scores, rolling_close_std
+from src.strategy.vol_breakout import VolBreakoutSpecialist
+
+
+def _frame(n, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.005,
+        'low': close * 0.995,
+        'close': close,
+        'volume': rng.uniform(1000, 5000, n),
+    })
+
+
+def _baseline_squeeze(data, bb_bandwidth):
+    # Vektorlestirme oncesi dongu (referans)
+    lookback = min(180, len(data))
+    historical_bw = []
+    for i in range(max(1, len(data) - lookback), len(data)):
+        if i >= 20:
+            period_data = data.iloc[i-20:i]
+            sma = period_data['close'].mean()
+            std = period_data['close'].std()
+            historical_bw.append(((sma + 2 * std) - (sma - 2 * std)) / period_data['close'].iloc[-1])
+    if historical_bw:
+        return 1.0 - sum(1 for bw in historical_bw if bb_bandwidth >= bw) / len(historical_bw)
+    return 0.5
+
+
+@pytest.mark.parametrize('n', [5, 20, 21, 22, 60, 181, 400])
+def test_squeeze_score_matches_per_bar_loop(n):
+    data = _frame(n)
+    last = data['close'].iloc[-1]
+    for width in (0.005, 0.02, 0.04, 0.08):
+        indicators = {'bb_upper': last * (1 + width / 2), 'bb_lower': last * (1 - width / 2), 'adx': 25, 'rsi': 55}
+        got = calculate_gating_scores(data, indicators)
+        assert got.squeeze_score == pytest.approx(_baseline_squeeze(data, width), abs=1e-12)
+
+
+def test_rolling_std_is_shared_per_frame_and_refreshed_on_change():
+    data = _frame(100)
+    first = rolling_close_std(data, 20)
+    assert rolling_close_std(data, 20) is first
+    grown = _frame(101)
+    assert len(rolling_close_std(grown, 20)) == 101
+    np.testing.assert_allclose(rolling_close_std(data, 20), data['close'].rolling(20).std().to_numpy(),
+                               equal_nan=True)
+
+
+def test_vol_breakout_signal_runs_on_shared_stats():
+    data = _frame(120)
+    specialist = VolBreakoutSpecialist()
+    sig = specialist.generate_signal('BTCUSDT', data, {'atr': 1.0})
+    assert sig.signal in ('AL', 'SAT', 'BEKLE')
+    assert 0.0 <= sig.confidence <= 1.0
@@ -60,5 +60,22 @@ class TestIndicators(unittest.TestCase):
         self.assertTrue(0 <= scores['total_score'] <= 100)
         self.assertIn(scores['signal'], ['AL', 'SAT', 'BEKLE'])
 
+    def test_score_indicators_series_matches_per_bar(self):
+        """Vektorize seri skor, her bar icin prefix skor ile ayni olmali"""
+        indicators = self.indicator_calc.calculate_all_indicators(self.df)
+        series = self.indicator_calc.score_indicators_series(self.df, indicators)
+        self.assertEqual(len(series['total_score']), 100)
+        for i in range(0, 100, 7):
+            sub = {}
+            for name, val in indicators.items():
+                if isinstance(val, dict):
+                    sub[name] = {k: v.iloc[: i + 1] for k, v in val.items()}
+                else:
+                    sub[name] = val.iloc[: i + 1]
+            scored = self.indicator_calc.score_indicators(self.df.iloc[: i + 1], sub)
+            np.testing.assert_array_equal(series['total_score'][i], scored['total_score'])
+            for name, val in scored['scores'].items():
+                np.testing.assert_array_equal(series['scores'][name][i], val)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,113 @@
+import time
+
+import pandas as pd
+
+import src.api.binance_api as binance_api_mod
+import src.data_fetcher as data_fetcher_mod
+from src.api.binance_api import INTERVAL_MS, BinanceAPI
+
+STEP = INTERVAL_MS['1h']
+
+
+def _kline(ts: int, close: float = 1.0):
+    return [ts, str(close), str(close), str(close), str(close), '1', ts + STEP - 1, '1', 1, '1', '1', '0']
+
+
+class _PagedAPI:
+    """startTime destekli sahte API: cagrilari kaydeder, page_limit kadar bar doner."""
+
+    def __init__(self, end_ms: int):
+        self.end_ms = end_ms
+        self.full_calls = 0
+        self.since_calls: list[int] = []
+
+    def get_historical_data(self, _symbol, _interval, days):
+        self.full_calls += 1
+        start = self.end_ms - (days * 24 - 1) * STEP
+        return BinanceAPI.klines_to_frame([_kline(start + i * STEP) for i in range(days * 24)])
+
+    def get_historical_klines(self, _symbol, _interval, limit=500, start_time=None):
+        self.since_calls.append(start_time)
+        out = []
+        ts = start_time
+        while ts <= self.end_ms and len(out) < limit:
+            out.append(_kline(ts, close=2.0))
+            ts += STEP
+        return out
+
+    def get_historical_data_since(self, symbol, interval, start_time, max_bars=None):
+        klines = BinanceAPI.get_klines_since(self, symbol, interval, start_time, max_bars=max_bars)
+        return BinanceAPI.klines_to_frame(klines)
+
+
+def _fetcher(tmp_path, api, monkeypatch):
+    monkeypatch.setattr(data_fetcher_mod, 'BinanceAPI', lambda: api)
+    f = data_fetcher_mod.DataFetcher()
+    f.data_path = str(tmp_path)
+    f.ensure_directories()
+    return f
+
+
+def test_get_klines_since_paginates_and_dedups(monkeypatch):
+    monkeypatch.setattr(binance_api_mod.Settings, 'KLINES_PAGE_LIMIT', 10, raising=False)
+    api = _PagedAPI(end_ms=1_000 * STEP)
+    out = BinanceAPI.get_klines_since(api, 'AAAUSDT', '1h', 975 * STEP)
+    assert [int(k[0]) for k in out] == [i * STEP for i in range(975, 1001)]
+    assert api.since_calls == [975 * STEP, 985 * STEP, 995 * STEP]
+
+
+def test_fetch_pair_data_only_downloads_missing_bars(tmp_path, monkeypatch):
+    now_ms = int(time.time() * 1000) // STEP * STEP
+    api = _PagedAPI(end_ms=now_ms - 5 * STEP)
+    f = _fetcher(tmp_path, api, monkeypatch)
+    assert f.fetch_pair_data('AAAUSDT', days=1, interval='1h')
+    assert api.full_calls == 1
+    assert len(f.store.read('AAAUSDT', '1h')) == 24
+
+    api.end_ms = now_ms
+    assert f.fetch_pair_data('AAAUSDT', days=1, interval='1h')
+    assert api.full_calls == 1
+    # Son saklanan bardan (dahil) itibaren istendi
+    assert api.since_calls == [now_ms - 5 * STEP]
+    df = f.store.read('AAAUSDT', '1h')
+    assert len(df) == 29
+    assert df['timestamp'].is_unique
+    assert df['timestamp'].iloc[-1] == pd.Timestamp(now_ms, unit='ms')
+    assert df['close'].iloc[-6:].tolist() == [2.0] * 6
+
+
+def test_fetch_pair_data_full_refresh_when_store_too_old(tmp_path, monkeypatch):
+    now_ms = int(time.time() * 1000) // STEP * STEP
+    api = _PagedAPI(end_ms=now_ms - 100 * STEP)
+    f = _fetcher(tmp_path, api, monkeypatch)
+    f.fetch_pair_data('BBBUSDT', days=1, interval='1h')
+    api.end_ms = now_ms
+    f.fetch_pair_data('BBBUSDT', days=1, interval='1h')
+    assert api.full_calls == 2
+    assert api.since_calls == []
+    assert len(f.store.read('BBBUSDT', '1h')) == 24
+
+
+def test_delta_appends_are_trimmed_to_days_window(tmp_path, monkeypatch):
+    now_ms = int(time.time() * 1000) // STEP * STEP
+    api = _PagedAPI(end_ms=now_ms - 90 * STEP)
+    f = _fetcher(tmp_path, api, monkeypatch)
+    f.fetch_pair_data('CCCUSDT', days=4, interval='1h')  # 96 bar
+    api.end_ms = now_ms
+    f.fetch_pair_data('CCCUSDT', days=4, interval='1h')  # +90 bar -> 186 > 96 + 64
+    df = f.store.read('CCCUSDT', '1h')
+    assert len(df) == 96
+    assert df['timestamp'].iloc[-1] == pd.Timestamp(now_ms, unit='ms')
+
+
+def test_offline_full_and_delta_fetch_share_grid(tmp_path, monkeypatch):
+    monkeypatch.setattr(binance_api_mod.Settings, 'OFFLINE_MODE', True, raising=False)
+    api = BinanceAPI.__new__(BinanceAPI)
+    step = INTERVAL_MS['5m']
+    full = api.get_historical_klines('ABCUSDT', '5m', limit=50)
+    assert all(int(k[0]) % step == 0 for k in full)
+    # Son bardan itibaren delta: ayni acilis zamani ve ayni degerler, fiyat yurumesi kesintisiz
+    delta = api.get_historical_klines('ABCUSDT', '5m', limit=10, start_time=int(full[-1][0]))
+    assert delta[0] == full[-1]
+    prev = full[-2]
+    assert float(full[-1][1]) == float(prev[4])
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import src.data_fetcher as data_fetcher_mod
+from src.utils.frame_cache import FrameCache
+
+
+class _Metrics:
+    def __init__(self):
+        self.events: list[str] = []
+
+    def record_frame_cache_event(self, event):
+        self.events.append(event)
+
+
+class _API:
+    def __init__(self):
+        self.metrics = _Metrics()
+
+
+def _frame(n: int = 50, close: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='h'),
+        'open': np.full(n, close),
+        'high': np.full(n, close),
+        'low': np.full(n, close),
+        'close': np.full(n, close),
+        'volume': np.ones(n),
+    })
+
+
+def _fetcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_fetcher_mod, 'BinanceAPI', _API)
+    f = data_fetcher_mod.DataFetcher()
+    f.data_path = str(tmp_path)
+    f.ensure_directories()
+    return f
+
+
+def test_frame_cache_lru_eviction_and_version():
+    events = []
+    cache = FrameCache(2, on_event=events.append)
+    cache.put('a', 1, 'A')
+    cache.put('b', 1, 'B')
+    assert cache.get('a', 1) == 'A'  # a en son kullanilan
+    cache.put('c', 1, 'C')  # b duser
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 2) is None  # version degisti -> bayat
+    assert cache.stats() == {'size': 1, 'max_entries': 2, 'hits': 1, 'misses': 2, 'evictions': 1}
+    assert events == ['hit', 'eviction', 'miss', 'miss']
+
+
+def test_get_pair_data_returns_shared_frame_until_mtime_changes(tmp_path, monkeypatch):
+    f = _fetcher(tmp_path, monkeypatch)
+    f.store.write('AAAUSDT', '1h', _frame())
+    first = f.get_pair_data('AAAUSDT', '1h', auto_fetch=False)
+    assert f.get_pair_data('AAAUSDT', '1h', auto_fetch=False) is first
+
+    f.store.append('AAAUSDT', '1h', _frame(60, close=2.0).iloc[-10:])
+    meta = os.path.join(f.store.path('AAAUSDT', '1h'), 'meta.json')
+    later = os.path.getmtime(meta) + 5
+    os.utime(meta, (later, later))
+    fresh = f.get_pair_data('AAAUSDT', '1h', auto_fetch=False)
+    assert fresh is not first
+    assert len(fresh) == 60
+    stats = f.frame_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+    assert f.api.metrics.events == ['miss', 'hit', 'miss']
+
+
+def test_fetch_pair_data_invalidates_cache(tmp_path, monkeypatch):
+    f = _fetcher(tmp_path, monkeypatch)
+    f.store.write('BBBUSDT', '1h', _frame())
+    first = f.get_pair_data('BBBUSDT', '1h', auto_fetch=False)
+    f.api.get_historical_data = lambda *_a, **_k: _frame(30, close=3.0)
+    monkeypatch.setattr(data_fetcher_mod.Settings, 'KLINE_DELTA_FETCH_ENABLED', False, raising=False)
+    assert f.fetch_pair_data('BBBUSDT', days=1, interval='1h')
+    again = f.get_pair_data('BBBUSDT', '1h', auto_fetch=False)
+    assert again is not first
+    assert len(again) == 30
+
+
+def test_frame_loaded_during_concurrent_write_is_not_cached(tmp_path, monkeypatch):
+    f = _fetcher(tmp_path, monkeypatch)
+    f.store.write('CCCUSDT', '1h', _frame())
+    real_load = f._load_pair_frame
+    meta = os.path.join(f.store.path('CCCUSDT', '1h'), 'meta.json')
+
+    def _load_then_append(symbol, interval):
+        df = real_load(symbol, interval)
+        # Okumadan hemen sonra esanli fetch_pair_data yazimi
+        f.store.append(symbol, interval, _frame(60, close=2.0).iloc[-10:])
+        later = os.path.getmtime(meta) + 5
+        os.utime(meta, (later, later))
+        return df
+
+    monkeypatch.setattr(f, '_load_pair_frame', _load_then_append)
+    stale = f.get_pair_data('CCCUSDT', '1h', auto_fetch=False)
+    assert len(stale) == 50
+    monkeypatch.setattr(f, '_load_pair_frame', real_load)
+    assert len(f.get_pair_data('CCCUSDT', '1h', auto_fetch=False)) == 60
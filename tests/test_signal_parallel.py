@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.signal_generator as signal_mod
+from src.signal_generator import SignalGenerator
+
+
+def _frame(seed, n=260):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='15min'),
+        'open': close,
+        'high': close * (1 + rng.uniform(0, 0.01, n)),
+        'low': close * (1 - rng.uniform(0, 0.01, n)),
+        'close': close,
+        'volume': rng.uniform(1000, 5000, n),
+    })
+
+
+class _Fetcher:
+    def __init__(self, pairs):
+        self.frames = {p: _frame(i) for i, p in enumerate(pairs)}
+
+    def get_pair_data(self, symbol, _timeframe):
+        return self.frames.get(symbol)
+
+
+PAIRS = ['AAAUSDT', 'BBBUSDT', 'MISSINGUSDT', 'CCCUSDT', 'DDDUSDT', 'EEEUSDT']
+
+
+def _run(monkeypatch, workers, executor='thread'):
+    monkeypatch.setattr(signal_mod.Settings, 'OFFLINE_MODE', True, raising=False)
+    monkeypatch.setattr(signal_mod.Settings, 'HTF_FILTER_ENABLED', False, raising=False)
+    monkeypatch.setattr(signal_mod.Settings, 'TIMEFRAME', '15m', raising=False)
+    monkeypatch.setattr(signal_mod.Settings, 'SIGNAL_WORKERS', workers, raising=False)
+    monkeypatch.setattr(signal_mod.Settings, 'SIGNAL_CPU_EXECUTOR', executor, raising=False)
+    sg = SignalGenerator()
+    sg.data_fetcher = _Fetcher([p for p in PAIRS if p != 'MISSINGUSDT'])
+    try:
+        return sg.generate_signals(PAIRS), sg
+    finally:
+        sg.close()
+
+
+def _strip(signals):
+    return {p: (s['signal'], s['signal_raw'], round(float(s['total_score']), 9), s['volume_24h'])
+            for p, s in signals.items()}
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_cycle_matches_serial_in_input_order(monkeypatch, executor):
+    serial, _ = _run(monkeypatch, 1)
+    parallel, sg = _run(monkeypatch, 3, executor)
+    assert list(parallel) == [p for p in PAIRS if p != 'MISSINGUSDT']
+    assert _strip(parallel) == _strip(serial)
+    timings = sg.last_cycle_timings
+    assert timings['mode'] == f'parallel_{executor}'
+    assert timings['pairs'] == len(PAIRS)
+    for stage in ('load', 'compute', 'finalize', 'total'):
+        assert timings[stage] >= 0
+
+
+def test_parallel_cycle_keeps_hysteresis_state(monkeypatch):
+    _, sg = _run(monkeypatch, 4)
+    emitted = set(sg._prev_signals)
+    assert emitted <= set(PAIRS) - {'MISSINGUSDT'}
+    serial, sg_serial = _run(monkeypatch, 1)
+    assert sg._prev_signals == sg_serial._prev_signals
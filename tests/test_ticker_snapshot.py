@@ -0,0 +1,95 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import src.signal_generator as signal_mod
+from src.api.ticker_snapshot import TickerSnapshot, get_ticker_snapshot, reset_ticker_snapshots
+from src.trader.core import Trader
+
+
+class _API:
+    mode = 'spot'
+
+    def __init__(self, n=150, delay=0.0):
+        self.bulk_calls = 0
+        self.single_calls = 0
+        self.delay = delay
+        self.tickers = [{'symbol': f'S{i}USDT', 'quoteVolume': str(1000.0 * (i + 1)), 'volume': '1',
+                         'bidPrice': '99.9', 'askPrice': '100.1', 'lastPrice': '100'} for i in range(n)]
+        self.client = SimpleNamespace(get_ticker=self._single)
+
+    def get_ticker_24hr(self):
+        self.bulk_calls += 1
+        time.sleep(self.delay)
+        return self.tickers
+
+    def _single(self, symbol=None):
+        self.single_calls += 1
+        return {'symbol': symbol, 'quoteVolume': '7', 'bidPrice': '90', 'askPrice': '110'}
+
+    def get_ticker(self, symbol):
+        return self._single(symbol=symbol)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_ticker_snapshots()
+    yield
+    reset_ticker_snapshots()
+
+
+def test_one_bulk_request_serves_every_symbol_until_ttl():
+    api = _API()
+    snap = TickerSnapshot(api, ttl_sec=60)
+    assert [snap.volume_24h(f'S{i}USDT') for i in range(150)] == [1000.0 * (i + 1) for i in range(150)]
+    assert snap.last_price('S0USDT') == 100.0
+    assert snap.volume_24h('NOPEUSDT') is None
+    assert api.bulk_calls == 1
+    snap.invalidate()
+    snap.volume_24h('S0USDT')
+    assert api.bulk_calls == 2
+
+
+def test_concurrent_refresh_is_single_flight_and_failure_keeps_snapshot():
+    api = _API(delay=0.05)
+    snap = TickerSnapshot(api, ttl_sec=60)
+    threads = [threading.Thread(target=snap.volume_24h, args=(f'S{i}USDT',)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert api.bulk_calls == 1
+    snap.invalidate()
+    api.get_ticker_24hr = lambda: (_ for _ in ()).throw(RuntimeError('429'))
+    assert snap.volume_24h('S1USDT') == 2000.0
+
+
+def test_signal_volume_uses_shared_snapshot(monkeypatch):
+    monkeypatch.setattr(signal_mod.Settings, 'OFFLINE_MODE', False, raising=False)
+    api = _API()
+    sg = signal_mod.SignalGenerator.__new__(signal_mod.SignalGenerator)
+    sg.data_fetcher = SimpleNamespace(api=api)
+    assert [sg.get_24h_volume(f'S{i}USDT') for i in range(150)] == [1000.0 * (i + 1) for i in range(150)]
+    assert api.bulk_calls == 1 and api.single_calls == 0
+    # Snapshot'ta olmayan sembol tekil cagriya duser
+    assert sg.get_24h_volume('OTHERUSDT') == 7.0
+    assert api.single_calls == 1
+    assert get_ticker_snapshot(_API()) is get_ticker_snapshot(api)
+
+
+def test_spread_guard_reads_fresh_snapshot_and_falls_back_when_stale(monkeypatch):
+    import src.trader.core as core_mod
+    monkeypatch.setattr(core_mod.Settings, 'OFFLINE_MODE', False, raising=False)
+    monkeypatch.setattr(core_mod.Settings, 'SPREAD_GUARD_ENABLED', True, raising=False)
+    monkeypatch.setattr(core_mod.Settings, 'SPREAD_MAX_BPS', 50.0, raising=False)
+    monkeypatch.setattr(core_mod.Settings, 'SPREAD_SNAPSHOT_MAX_AGE_SEC', 10.0, raising=False)
+    api = _API()
+    trader = SimpleNamespace(api=api, logger=SimpleNamespace(warning=lambda *_a, **_k: None))
+    # Snapshot hic cekilmedi: toplu yenileme tetiklenmez, tekil ticker (2000 bps spread) bloklar
+    assert Trader._check_spread_guard(trader, 'S0USDT') is False
+    assert api.bulk_calls == 0 and api.single_calls == 1
+    get_ticker_snapshot(api).tickers()
+    assert Trader._check_spread_guard(trader, 'S0USDT') is True  # 20 bps
+    assert api.single_calls == 1
@@ -415,5 +415,55 @@ class TestEdgeCases:
         assert detection is not None  # Should work without TA-Lib
 
 
+
+class TestStreamingState:
+    """Ring buffer + kayan toplam yolunun dizi tabanli referans hesaplarla esitligi"""
+
+    @staticmethod
+    def _feed(detector, n, seed=11):
+        rng = np.random.default_rng(seed)
+        price = 100.0
+        for t in range(n):
+            price *= np.exp(rng.normal(0.0003 if (t // 200) % 2 else -0.0003, 0.01))
+            detector.update_data(price, 1000.0 + rng.uniform(0, 500) + t, float(t))
+
+    def _assert_matches_reference(self, detector):
+        prices = np.array([p[0] for p in detector.price_history])
+        volumes = np.array([v[0] for v in detector.volume_history])
+        assert detector._streaming_trend_strength(prices) == pytest.approx(
+            detector._calculate_trend_strength(prices), abs=1e-9)
+        assert detector._current_volatility() == pytest.approx(
+            detector._calculate_volatility(prices[-detector.vol_window:]), rel=1e-9)
+        assert detector._streaming_autocorrelation() == pytest.approx(
+            detector._calculate_autocorrelation(prices), abs=1e-9)
+        assert detector._streaming_volume_alignment() == detector._calculate_volume_trend_alignment(prices, volumes)
+
+    def test_matches_array_reference_after_wraparound_and_resync(self):
+        detector = VolatilityRegimeDetector()
+        for n in (60, 399, 400, 1500):
+            self._feed(detector, n if n == 60 else n - len(detector.price_history), seed=n)
+            self._assert_matches_reference(detector)
+        assert len(detector.price_history) == detector.price_history.capacity
+        # Son _feed cagrisi 1100 tick besledi (ts 0..1099)
+        assert detector.price_history[-1][1] == 1099.0
+
+    def test_bad_tick_recovers_once_out_of_window(self):
+        detector = VolatilityRegimeDetector({'lookback_medium': 20, 'lookback_long': 50})
+        self._feed(detector, 100)
+        detector.update_data(float('nan'), 1000.0)
+        detector.update_data(float('inf'), float('inf'))
+        self._feed(detector, 60, seed=3)
+        self._assert_matches_reference(detector)
+        assert np.isfinite(detector._current_volatility())
+
+    def test_state_is_preallocated_and_bounded(self):
+        detector = VolatilityRegimeDetector()
+        nbytes = sum(r._buf.nbytes for r in (detector.price_history, detector.volume_history,
+                                              detector.volatility_history, detector._returns))
+        self._feed(detector, 3000)
+        assert sum(r._buf.nbytes for r in (detector.price_history, detector.volume_history,
+                                           detector.volatility_history, detector._returns)) == nbytes
+        assert nbytes < 64 * 1024
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])